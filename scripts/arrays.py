@@ -0,0 +1,162 @@
+import operator
+import sys
+from array import array
+from typing import Callable, Iterable, Iterator, List, Tuple, Union
+from scripts import tables
+from scripts.exceptions import RomanNumeralValueError
+from scripts.roman import Roman
+
+
+def _rebuild(data: bytes) -> 'RomanArray':
+    """ Rebuilds a RomanArray out of its decimal values, stored as little-endian bytes, when unpickling. Only the
+    largest value needs to be checked, since the values are unsigned """
+    decimals = array(RomanArray.TYPECODE)
+    decimals.frombytes(data)
+    if sys.byteorder == 'big':
+        decimals.byteswap()
+    if decimals and max(decimals) > tables.MAX_VALUE:
+        raise RomanNumeralValueError(Roman.validate(max(decimals)))
+
+    return RomanArray._from_view(memoryview(decimals))
+
+
+class RomanArray:
+    """ Compact container of Roman numerals, storing only their decimal values in an unsigned 16-bit integer buffer.
+    Elements are turned into Roman objects on demand, when indexing or iterating over the array. Slicing returns a
+    RomanArray sharing the buffer of the original array, without copying it """
+    TYPECODE = 'H'
+
+    def __init__(self, values: Iterable[Union[str, int, Roman]] = ()):
+        """ The constructor converts each of the given values (Roman numerals or their str / int representations) to
+        its decimal value, validating it, and stores the results in a new buffer """
+        self._data = memoryview(array(RomanArray.TYPECODE, (Roman._decimal_of(value) for value in values)))
+
+    @classmethod
+    def _from_view(cls, view: memoryview) -> 'RomanArray':
+        """ Builds a RomanArray around an existing, already validated, memoryview; no data is copied """
+        instance = cls.__new__(cls)
+        instance._data = view
+        return instance
+
+    @classmethod
+    def _from_decimals(cls, decimals: List[int]) -> 'RomanArray':
+        """ Builds a RomanArray out of a list of decimal values, checking that all of them are inside the domain """
+        if decimals:
+            for extreme in (min(decimals), max(decimals)):
+                validation_result = Roman.validate(extreme)
+                if validation_result != 'OK':
+                    raise RomanNumeralValueError(validation_result)
+
+        return cls._from_view(memoryview(array(RomanArray.TYPECODE, decimals)))
+
+    ### Buffer access
+    @property
+    def data(self) -> memoryview:
+        """ Returns a read-only memoryview over the decimal values of the array, for interoperability with other
+        consumers of the buffer protocol; values are changed through __setitem__, which validates them """
+        return self._data.toreadonly()
+
+    @property
+    def nbytes(self) -> int:
+        """ Returns the number of bytes occupied by the decimal values of the array """
+        return self._data.nbytes
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """ Exposes the buffer protocol (PEP 688), read-only, so that memoryview(RomanArray(...)) works directly """
+        return self._data.toreadonly()
+
+    ### Serialization methods
+    def __reduce__(self) -> Tuple[Callable[[bytes], 'RomanArray'], Tuple[bytes]]:
+        """ Makes pickling (and copying) store the decimal values as little-endian bytes. The unpickled array owns a new
+        buffer, even if the original one is a view """
+        decimals = array(RomanArray.TYPECODE, self._data)
+        if sys.byteorder == 'big':
+            decimals.byteswap()
+        return _rebuild, (decimals.tobytes(),)
+
+    ### Conversion methods
+    def __repr__(self) -> str:
+        """ Returns an information-rich string representation of the array """
+        return f'RomanArray({self.to_strings()})'
+
+    def tolist(self) -> List[int]:
+        """ Returns the decimal values of the array as a list of integers """
+        return self._data.tolist()
+
+    def to_strings(self) -> List[str]:
+        """ Returns the Roman representations of all the elements in the array """
+        return list(map(tables.roman_table().__getitem__, self._data))
+
+    ### Sequence protocol
+    def __len__(self) -> int:
+        """ Returns the number of elements in the array """
+        return len(self._data)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Roman, 'RomanArray']:
+        """ Returns the Roman numeral found at the given index, or a view over the elements in the given slice """
+        if isinstance(index, slice):
+            return RomanArray._from_view(self._data[index])
+
+        return Roman(self._data[index])
+
+    def __setitem__(self, index: int, value: Union[str, int, Roman]) -> None:
+        """ Replaces the element found at the given index; the change is visible in all the views sharing the buffer """
+        self._data[index] = Roman._decimal_of(value)
+
+    def __iter__(self) -> Iterator[Roman]:
+        """ Iterates over the elements of the array, building each Roman numeral only when it is requested """
+        for decimal in self._data:
+            yield Roman(decimal)
+
+    def __eq__(self, other) -> bool:
+        """ Two arrays are equal if they hold the same decimal values, in the same order """
+        if isinstance(other, RomanArray):
+            return self._data == other._data
+
+        return NotImplemented
+
+    ### Arithmetic operators
+    def _apply(self, other, function: Callable[[int, int], int]) -> 'RomanArray':
+        """ Applies the given binary function element-wise on the array and a scalar or an array of the same length,
+        checking that the results are still valid Roman numerals """
+        if isinstance(other, RomanArray):
+            if len(other) != len(self):
+                message = 'Element-wise operations require arrays of equal length ({} != {})'
+                raise ValueError(message.format(len(self), len(other)))
+            decimals = list(map(function, self._data, other._data))
+        elif isinstance(other, (Roman, int, str)):
+            scalar = Roman._decimal_of(other) if not isinstance(other, int) else other
+            decimals = [function(decimal, scalar) for decimal in self._data]
+        else:
+            message = 'RomanArray operations require RomanArray, Roman, str or int as operand, not {}'
+            raise TypeError(message.format(type(other)))
+
+        return RomanArray._from_decimals(decimals)
+
+    def __add__(self, other) -> 'RomanArray':
+        """ Implements the element-wise addition """
+        return self._apply(other, operator.add)
+
+    def __radd__(self, other) -> 'RomanArray':
+        """ Implements the right-sided element-wise addition """
+        return self._apply(other, operator.add)
+
+    def __sub__(self, other) -> 'RomanArray':
+        """ Implements the element-wise subtraction """
+        return self._apply(other, operator.sub)
+
+    def __mul__(self, other) -> 'RomanArray':
+        """ Implements the element-wise multiplication """
+        return self._apply(other, operator.mul)
+
+    def __rmul__(self, other) -> 'RomanArray':
+        """ Implements the right-sided element-wise multiplication """
+        return self._apply(other, operator.mul)
+
+    def __floordiv__(self, other) -> 'RomanArray':
+        """ Implements the element-wise floor division """
+        return self._apply(other, operator.floordiv)
+
+    def __mod__(self, other) -> 'RomanArray':
+        """ Implements the element-wise modulus operation """
+        return self._apply(other, operator.mod)
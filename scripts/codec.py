@@ -0,0 +1,149 @@
+import sys
+from array import array
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, Union
+from scripts.arrays import RomanArray
+from scripts.exceptions import RomanNumeralValueError
+from scripts.roman import Roman
+
+
+# Every encoded stream starts with the magic bytes, followed by one byte holding the word width (12 or 16 bits)
+MAGIC = b'RN'
+HEADER_SIZE = len(MAGIC) + 1
+WIDTHS = (12, 16)
+
+# 12-bit words are packed in pairs, into 3 bytes; an odd number of values is completed with a padding word, whose
+# value is outside of the Roman numerals domain
+PADDING = 0xFFF
+
+
+def _header(width: int) -> bytes:
+    """ Builds the stream header for the given word width """
+    if width not in WIDTHS:
+        raise ValueError(f'The word width must be one of {WIDTHS} (Given: {width})')
+
+    return MAGIC + bytes([width])
+
+
+def _parse_header(header: bytes) -> int:
+    """ Checks the stream header and returns the word width it specifies """
+    if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC or header[-1] not in WIDTHS:
+        raise ValueError(f'The data does not start with a valid Roman numerals stream header (Found {header!r})')
+
+    return header[-1]
+
+
+def _pack(numerals: RomanArray, width: int) -> bytes:
+    """ Packs the decimal values of the given numerals into words of the given width """
+    if width == 16:
+        words = array('H', numerals.data)
+        if sys.byteorder == 'big':
+            words.byteswap()
+        return words.tobytes()
+
+    decimals = numerals.tolist()
+    if len(decimals) % 2:
+        decimals.append(PADDING)
+
+    packed = bytearray()
+    for first, second in zip(decimals[::2], decimals[1::2]):
+        packed += bytes((first >> 4, (first & 0xF) << 4 | second >> 8, second & 0xFF))
+
+    return bytes(packed)
+
+
+def _unpack(data: bytes, width: int, final: bool = False) -> Iterator[int]:
+    """ Unpacks the decimal values stored in words of the given width; the data must hold a whole number of words. A
+    padding word is only accepted as the very last word of the <final> data of a 12-bit stream """
+    if width == 16:
+        words = array('H', data)
+        if sys.byteorder == 'big':
+            words.byteswap()
+        decimals: Iterable[int] = words
+    else:
+        decimals = (value
+                    for i in range(0, len(data), 3)
+                    for value in (data[i] << 4 | data[i + 1] >> 4, (data[i + 1] & 0xF) << 8 | data[i + 2]))
+
+    end = len(data) // 3 * 2 - 1 if width == 12 and final else -1
+    for i, decimal in enumerate(decimals):
+        if decimal > 3999:
+            if i == end and decimal == PADDING:
+                continue
+            if width == 12 and decimal == PADDING:
+                raise RomanNumeralValueError('The padding word can only appear at the end of the stream')
+            raise RomanNumeralValueError(f'The maximum Roman numeral is 3999 (Decoded {decimal})')
+        yield decimal
+
+
+### Bulk functions
+def encode(values: Iterable[Union[str, int, Roman]], width: int = 12) -> bytes:
+    """ Encodes the given Roman numerals (or their representations) into the compact binary format """
+    return b''.join(iter_encode(values, width))
+
+
+def decode(data: bytes) -> RomanArray:
+    """ Decodes the Roman numerals stored in the compact binary format """
+    return RomanArray(iter_decode([data]))
+
+
+### Streaming functions
+def iter_encode(values: Iterable[Union[str, int, Roman]], width: int = 12,
+                chunk_size: int = 4096) -> Iterator[bytes]:
+    """ Generator function which encodes the given Roman numerals lazily, yielding the stream header followed by one
+    chunk of encoded data for every <chunk_size> numerals. The chunk size is rounded up to an even number, so that
+    padding only ever appears at the end of the stream """
+    if chunk_size < 1:
+        raise ValueError(f'The chunk size must be positive (Given: {chunk_size})')
+    yield _header(width)
+
+    chunk_size += chunk_size % 2
+    iterator = iter(values)
+    while True:
+        chunk = RomanArray(islice(iterator, chunk_size))
+        if not len(chunk):
+            break
+        yield _pack(chunk, width)
+
+
+def iter_decode(chunks: Iterable[bytes]) -> Iterator[int]:
+    """ Generator function which decodes a stream of Roman numerals delivered in arbitrarily sized chunks, yielding
+    the decimal values as soon as their words are complete. In 12-bit streams, the last pair of words received is
+    held back until more data arrives, since only the pair ending the stream may hold the padding word """
+    buffer = b''
+    width = None
+    word_size = 0
+
+    for chunk in chunks:
+        buffer += chunk
+        if width is None:
+            if len(buffer) < HEADER_SIZE:
+                continue
+            width = _parse_header(buffer[:HEADER_SIZE])
+            word_size = 2 if width == 16 else 3
+            buffer = buffer[HEADER_SIZE:]
+
+        complete = len(buffer) - len(buffer) % word_size
+        if width == 12:
+            complete = max(complete - word_size, 0)
+        yield from _unpack(buffer[:complete], width)
+        buffer = buffer[complete:]
+
+    if width is None:
+        raise ValueError(f'The data does not start with a valid Roman numerals stream header (Found {buffer!r})')
+    if len(buffer) % word_size:
+        raise ValueError(f'The stream ends with an incomplete word ({len(buffer) % word_size} trailing bytes)')
+    yield from _unpack(buffer, width, final=True)
+
+
+def dump(values: Iterable[Union[str, int, Roman]], fp: BinaryIO, width: int = 12) -> None:
+    """ Writes the given Roman numerals into a binary file, in the compact binary format """
+    for chunk in iter_encode(values, width):
+        fp.write(chunk)
+
+
+def load(fp: BinaryIO, chunk_size: int = 65536) -> Iterator[int]:
+    """ Generator function which reads Roman numerals in the compact binary format from a binary file """
+    if chunk_size < 1:
+        raise ValueError(f'The chunk size must be positive (Given: {chunk_size})')
+    yield from iter_decode(iter(lambda: fp.read(chunk_size), b''))
@@ -0,0 +1,95 @@
+from collections.abc import MutableMapping, MutableSet
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+from scripts import tables
+from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
+from scripts.roman import Roman
+
+
+Key = Union[Roman, str, int]
+
+
+def _lookup_key(key: Any) -> Optional[int]:
+    """ Returns the decimal value of a key being looked up, or None if the key is not a valid representation (such a key
+    can never be present, so looking it up behaves like looking up a missing key) """
+    if type(key) is int:
+        return key if 0 <= key <= tables.MAX_VALUE else None
+    try:
+        return Roman._decimal_of(key)
+    except (RomanNumeralTypeError, RomanNumeralValueError):
+        return None
+
+
+class RomanKeyedDict(MutableMapping):
+    """ Dictionary keyed by Roman numerals, in which a Roman numeral and all its representations (e.g. Roman(14), 14,
+    'XIV' and 'xiv') are the same key. Every key is converted to its decimal value once, when inserting or looking it
+    up, and the values are stored in a plain dict keyed by integers, so lookups never compare Roman numerals. Iterating
+    yields the keys as new Roman numerals """
+    def __init__(self, items: Union[Iterable[Tuple[Key, Any]], Dict[Key, Any]] = (), **kwargs):
+        """ The constructor accepts the same arguments as dict, validating all the keys """
+        self._data: Dict[int, Any] = {}
+        self.update(items, **kwargs)
+
+    def __getitem__(self, key: Key) -> Any:
+        decimal = _lookup_key(key)
+        if decimal is None or decimal not in self._data:
+            raise KeyError(key)
+        return self._data[decimal]
+
+    def __setitem__(self, key: Key, value: Any) -> None:
+        """ Inserts a value, raising the errors of Roman.validate for keys which are not valid representations """
+        self._data[Roman._decimal_of(key)] = value
+
+    def __delitem__(self, key: Key) -> None:
+        decimal = _lookup_key(key)
+        if decimal is None or decimal not in self._data:
+            raise KeyError(key)
+        del self._data[decimal]
+
+    def __contains__(self, key: object) -> bool:
+        return _lookup_key(key) in self._data
+
+    def __iter__(self) -> Iterator[Roman]:
+        return map(Roman, self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({{{", ".join(f"{tables.to_roman(k)}: {v!r}" for k, v in self._data.items())}}})'
+
+    def decimal_items(self) -> Iterator[Tuple[int, Any]]:
+        """ Returns the items with the keys as decimal values, without building Roman numerals """
+        return iter(self._data.items())
+
+
+class RomanSet(MutableSet):
+    """ Set of Roman numerals, in which a Roman numeral and all its representations are the same element. The elements
+    are stored as decimal values in a plain set; iterating yields them as new Roman numerals """
+    def __init__(self, numerals: Iterable[Key] = ()):
+        """ The constructor validates all the given numerals """
+        self._data: Set[int] = {Roman._decimal_of(numeral) for numeral in numerals}
+
+    def __contains__(self, numeral: object) -> bool:
+        return _lookup_key(numeral) in self._data
+
+    def __iter__(self) -> Iterator[Roman]:
+        return map(Roman, self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({{{", ".join(map(tables.to_roman, sorted(self._data)))}}})'
+
+    def add(self, numeral: Key) -> None:
+        """ Adds a numeral, raising the errors of Roman.validate for invalid representations """
+        self._data.add(Roman._decimal_of(numeral))
+
+    def discard(self, numeral: Key) -> None:
+        decimal = _lookup_key(numeral)
+        if decimal is not None:
+            self._data.discard(decimal)
+
+    def decimals(self) -> Set[int]:
+        """ Returns a copy of the elements, as decimal values """
+        return set(self._data)
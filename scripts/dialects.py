@@ -0,0 +1,131 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+from scripts import tables
+from scripts.enums import Dialect, RomanNumeral
+from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
+from scripts.roman import Roman
+
+
+LETTER_VALUES = {r.name: r.value for r in RomanNumeral if r.value}
+
+
+class CompiledDialect:
+    """ Lookup tables of a dialect, built once: the representation of every number in the domain (used for formatting)
+    and a mapping from every representation the dialect accepts to its decimal value (used for parsing) """
+    def __init__(self, dialect: Dialect, format_table: Tuple[str, ...], parse_table: Dict[str, int]):
+        self.dialect = dialect
+        self.format_table = format_table
+        self.parse_table = parse_table
+
+
+def _additive(decimal_number: int) -> str:
+    """ Writes a number in the purely additive notation (e.g. 1994 = MDCCCCLXXXXIIII) """
+    if decimal_number == 0:
+        return 'N'
+
+    representation = 'M' * (decimal_number // 1000)
+    for letter, half_letter, unit in (('C', 'D', 100), ('X', 'L', 10), ('I', 'V', 1)):
+        digit = decimal_number // unit % 10
+        representation += half_letter * (digit // 5) + letter * (digit % 5)
+
+    return representation
+
+
+def _clock(decimal_number: int) -> str:
+    """ Writes a number as on a clock face, where the units digit 4 is written as IIII (e.g. 1994 = MCMXCIIII) """
+    if decimal_number % 10 != 4:
+        return tables.roman_table()[decimal_number]
+
+    return tables.roman_table()[decimal_number - 4].replace('N', '') + 'IIII'
+
+
+def _format_table(dialect: Dialect) -> Tuple[str, ...]:
+    """ Builds the representations of all the numbers in the domain, in the given dialect """
+    if dialect is Dialect.ADDITIVE:
+        return tuple(_additive(i) for i in range(tables.MAX_VALUE + 1))
+    if dialect is Dialect.CLOCK:
+        return tuple(_clock(i) for i in range(tables.MAX_VALUE + 1))
+
+    return tables.roman_table()
+
+
+@tables.derived
+@lru_cache(maxsize=None)
+def compiled(dialect: Dialect) -> CompiledDialect:
+    """ Returns the lookup tables of the given dialect, which are built the first time they are requested. Besides their
+    own representations, the additive and clock face dialects also parse the strict ones, while the lenient dialect
+    parses the representations of all the other dialects """
+    format_table = _format_table(dialect)
+    sources = list(Dialect) if dialect is Dialect.LENIENT else [Dialect.STRICT, dialect]
+
+    parse_table: Dict[str, int] = {}
+    for source in sources:
+        table = format_table if source is dialect else _format_table(source)
+        for decimal, representation in enumerate(table):
+            parse_table.setdefault(representation, decimal)
+
+    return CompiledDialect(dialect, format_table, parse_table)
+
+
+@lru_cache(maxsize=4096)
+def _parse_lenient(roman_number: str) -> int:
+    """ Parses an irregular representation with the medieval rule, walking it from right to left: a letter smaller than
+    the largest letter found to its right is subtracted, any other letter is added (e.g. IIX = 8, XIIX = 18) """
+    invalid_characters = set(roman_number).difference(LETTER_VALUES)
+    if not roman_number:
+        raise RomanNumeralValueError('The string representation provided is empty')
+    if invalid_characters:
+        message = 'The string representation provided contains invalid characters: {}'
+        raise RomanNumeralValueError(message.format(invalid_characters))
+
+    decimal_number = 0
+    largest = 0
+    for letter in reversed(roman_number):
+        value = LETTER_VALUES[letter]
+        if value < largest:
+            decimal_number -= value
+        else:
+            decimal_number += value
+            largest = value
+
+    validation_result = Roman.validate(decimal_number)
+    if validation_result != 'OK':
+        raise RomanNumeralValueError(f'{validation_result} (Parsed from {roman_number})')
+
+    return decimal_number
+
+
+def to_decimal(roman_number: str, dialect: Dialect = Dialect.STRICT) -> int:
+    """ Converts a representation written in the given dialect to its decimal value. The lookup table of the dialect is
+    tried first; the representations missing from it are checked with Roman.validate by the strict dialect, parsed with
+    the medieval rule by the lenient dialect and rejected by the other dialects """
+    if not isinstance(roman_number, str):
+        message = 'The representation of the Roman numeral must be in str format (Given: {})'
+        raise RomanNumeralTypeError(message.format(type(roman_number)))
+
+    roman_number = tables.normalize(roman_number)
+    decimal_number = compiled(dialect).parse_table.get(roman_number)
+    if decimal_number is not None:
+        return decimal_number
+
+    if dialect is Dialect.STRICT:
+        return Roman.convert_to_decimal(roman_number)
+    if dialect is Dialect.LENIENT:
+        return _parse_lenient(roman_number)
+
+    raise RomanNumeralValueError(f'{roman_number!r} is not a valid Roman numeral in the {dialect.value} dialect')
+
+
+def to_roman(decimal_number: int, dialect: Dialect = Dialect.STRICT) -> str:
+    """ Converts a decimal number to its representation in the given dialect (the lenient dialect writes the strict
+    representations) """
+    validation_result = Roman.validate(decimal_number)
+    if validation_result != 'OK':
+        raise RomanNumeralValueError(validation_result)
+
+    return compiled(dialect).format_table[decimal_number]
+
+
+def canonicalize(roman_number: str, dialect: Dialect = Dialect.LENIENT) -> str:
+    """ Rewrites a representation written in the given dialect (in any dialect, by default) in the strict notation """
+    return tables.roman_table()[to_decimal(roman_number, dialect)]
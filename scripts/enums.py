@@ -1,4 +1,4 @@
-from enum import Enum, unique
+from enum import Enum, IntFlag, unique
 
 
 @unique
@@ -12,3 +12,34 @@ class RomanNumeral(Enum):
     C = 100
     D = 500
     M = 1000
+
+
+@unique
+class NumeralProperty(IntFlag):
+    """ Flag enumeration used for representing the properties of a Roman numeral; the subtractive pair members mark
+    numerals whose roman representation contains the respective pair of letters """
+    PRIME = 1
+    FIBONACCI = 2
+    IV = 4
+    IX = 8
+    XL = 16
+    XC = 32
+    CD = 64
+    CM = 128
+
+
+@unique
+class Dialect(Enum):
+    """ Enumeration used for representing the notations in which Roman numerals can be written """
+    STRICT = 'strict'  # The notation enforced by Roman.validate (e.g. 4 = IV, 9 = IX, 1994 = MCMXCIV)
+    ADDITIVE = 'additive'  # Purely additive notation, without subtractive pairs (e.g. 4 = IIII, 9 = VIIII)
+    CLOCK = 'clock'  # Clock face notation, in which only the units digit 4 is additive (e.g. 4 = IIII, 14 = XIIII)
+    LENIENT = 'lenient'  # Medieval notation, accepting irregular subtractive forms (e.g. 8 = IIX, 18 = XIIX)
+
+
+@unique
+class ValidationPolicy(Enum):
+    """ Enumeration used for representing how the batch_validated decorator handles the invalid representations """
+    RAISE = 'raise'  # Raise a RomanNumeralValueError for the first invalid representation
+    FILTER = 'filter'  # Drop the invalid representations, passing only the valid ones to the wrapped function
+    PARTITION = 'partition'  # Drop the invalid representations and also return them, with their errors
@@ -0,0 +1,125 @@
+import operator
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+from scripts import tables
+from scripts.exceptions import RomanNumeralValueError
+from scripts.roman import Roman
+
+
+OPERATORS: Dict[str, Callable[[int, int], int]] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '//': operator.floordiv,
+    '%': operator.mod,
+}
+
+Operand = Union['RomanExpression', Roman, str, int]
+
+
+class RomanExpression:
+    """ Lazy arithmetic expression over Roman numerals. Applying operators on an expression only builds a tree; the
+    tree is evaluated with plain integers by evaluate(), so only the final result has to be a valid Roman numeral
+    (intermediate results may be negative or bigger than 3999) and only one Roman object is built """
+    __slots__ = ('symbol', 'operands')
+
+    def __init__(self, symbol: Optional[str], operands: Tuple):
+        """ The constructor is used internally; expressions are started with Roman.expr(...) or RomanExpression.of(...)
+        and extended with the arithmetic operators. Leaves have no symbol and hold one decimal value """
+        self.symbol = symbol
+        self.operands = operands
+
+    @staticmethod
+    def of(operand: Operand) -> 'RomanExpression':
+        """ Wraps a Roman numeral (or one of its representations) into a leaf expression; the leaves, unlike the
+        intermediate results, are validated """
+        if isinstance(operand, RomanExpression):
+            return operand
+
+        return RomanExpression(None, (Roman._decimal_of(operand),))
+
+    def _combine(self, symbol: str, other: Operand, reflected: bool = False) -> 'RomanExpression':
+        """ Builds the node applying the operator with the given symbol on the expression and another operand """
+        if not isinstance(other, (RomanExpression, Roman, str, int)):
+            return NotImplemented
+        other = RomanExpression.of(other)
+
+        return RomanExpression(symbol, (other, self) if reflected else (self, other))
+
+    ### Arithmetic operators
+    def __add__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('+', other)
+
+    def __radd__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('+', other, reflected=True)
+
+    def __sub__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('-', other)
+
+    def __rsub__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('-', other, reflected=True)
+
+    def __mul__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('*', other)
+
+    def __rmul__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('*', other, reflected=True)
+
+    def __floordiv__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('//', other)
+
+    def __rfloordiv__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('//', other, reflected=True)
+
+    def __mod__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('%', other)
+
+    def __rmod__(self, other: Operand) -> 'RomanExpression':
+        return self._combine('%', other, reflected=True)
+
+    ### Evaluation
+    def value(self, cache: bool = True) -> int:
+        """ Evaluates the expression with plain integers, without validating the result. With <cache>, identical
+        sub-expressions (e.g. the two "a + b" in "(a + b) * (a + b)", even if built separately) are only evaluated
+        once. The tree is walked iteratively, so arbitrarily long chains of operations are supported """
+        # Every visited node gets a structural id, equal for identical sub-expressions, and a value
+        results: Dict[int, Tuple[int, int]] = {}
+        structures: Dict[Hashable, Tuple[int, int]] = {}
+        stack: List[Tuple[RomanExpression, bool]] = [(self, False)]
+
+        while stack:
+            node, expanded = stack.pop()
+            if cache and id(node) in results:
+                continue
+
+            if node.symbol is None:
+                structure: Hashable = node.operands[0]
+                if structure not in structures:
+                    structures[structure] = (len(structures), node.operands[0])
+            elif not expanded:
+                stack += [(node, True), (node.operands[1], False), (node.operands[0], False)]
+                continue
+            else:
+                (left_id, left), (right_id, right) = results[id(node.operands[0])], results[id(node.operands[1])]
+                structure = (node.symbol, left_id, right_id)
+                if not cache or structure not in structures:
+                    structures[structure] = (len(structures), OPERATORS[node.symbol](left, right))
+
+            results[id(node)] = structures[structure]
+
+        return results[id(self)][1]
+
+    def evaluate(self, cache: bool = True) -> Roman:
+        """ Evaluates the expression and returns the result as a Roman numeral, after validating it """
+        result = self.value(cache)
+        validation_result = Roman.validate(result)
+        if validation_result != 'OK':
+            raise RomanNumeralValueError(validation_result)
+
+        return Roman(result)
+
+    def __repr__(self) -> str:
+        """ Returns the expression in infix notation, with the leaves in Roman representation """
+        if self.symbol is None:
+            return tables.to_roman(self.operands[0])
+
+        return f'({self.operands[0]!r} {self.symbol} {self.operands[1]!r})'
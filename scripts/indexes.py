@@ -0,0 +1,184 @@
+import bisect
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from scripts import tables
+from scripts.enums import NumeralProperty, RomanNumeral
+from scripts.roman import Roman
+
+
+SUBTRACTIVE_PAIRS = [p for p in NumeralProperty if p.name not in ('PRIME', 'FIBONACCI')]
+
+
+def _sieve(limit: int) -> List[bool]:
+    """ Returns the primality of all the numbers from 0 to <limit>, computed with the sieve of Eratosthenes """
+    is_prime = [False, False] + [True] * (limit - 1)
+    for candidate in range(2, int(limit ** 0.5) + 1):
+        if is_prime[candidate]:
+            multiples = range(candidate * candidate, limit + 1, candidate)
+            is_prime[multiples.start::candidate] = [False] * len(multiples)
+
+    return is_prime
+
+
+class PropertyIndex:
+    """ Static index over the properties of all the numbers in the domain (0 to 3999): the length of their roman
+    representation, the number of occurrences of each letter in it and their NumeralProperty flags. For each possible
+    value of a property, the numbers having it are kept in a sorted array, so queries only touch matching numbers """
+    def __init__(self) -> None:
+        """ The constructor computes the properties of every number and groups the numbers by each of them """
+        romans = tables.roman_table()
+        is_prime = _sieve(tables.MAX_VALUE)
+
+        self.lengths = array('B', map(len, romans))
+        self.symbol_counts = {r.name: array('B', (roman.count(r.name) for roman in romans)) for r in RomanNumeral}
+        self.properties = array('H', [0]) * len(romans)
+        for decimal, roman in enumerate(romans):
+            flags = NumeralProperty(0)
+            if is_prime[decimal]:
+                flags |= NumeralProperty.PRIME
+            if Roman.is_fibonacci(decimal):
+                flags |= NumeralProperty.FIBONACCI
+            for pair in SUBTRACTIVE_PAIRS:
+                if str(pair.name) in roman:
+                    flags |= pair
+            self.properties[decimal] = flags
+
+        self._by_length: Dict[int, array] = {}
+        self._by_symbol_count: Dict[Tuple[str, int], array] = {}
+        self._by_property: Dict[NumeralProperty, array] = {p: array('H') for p in NumeralProperty}
+        for decimal in range(len(romans)):
+            self._by_length.setdefault(self.lengths[decimal], array('H')).append(decimal)
+            for letter, counts in self.symbol_counts.items():
+                if counts[decimal]:
+                    self._by_symbol_count.setdefault((letter, counts[decimal]), array('H')).append(decimal)
+            for p in NumeralProperty:
+                if self.properties[decimal] & p:
+                    self._by_property[p].append(decimal)
+
+    @staticmethod
+    def _between(values: array, start: Union[Roman, str, int], stop: Union[Roman, str, int]) -> array:
+        """ Returns the part of a sorted array of numbers found between <start> and <stop> (both included) """
+        return values[bisect.bisect_left(values, Roman._decimal_of(start)):
+                      bisect.bisect_right(values, Roman._decimal_of(stop))]
+
+    def with_length(self, length: int, start: Union[Roman, str, int] = 0,
+                    stop: Union[Roman, str, int] = tables.MAX_VALUE) -> array:
+        """ Returns the sorted numbers between <start> and <stop> whose roman representation has the given length """
+        return PropertyIndex._between(self._by_length.get(length, array('H')), start, stop)
+
+    def with_symbol_count(self, letter: str, count: int, start: Union[Roman, str, int] = 0,
+                          stop: Union[Roman, str, int] = tables.MAX_VALUE) -> array:
+        """ Returns the sorted numbers between <start> and <stop> whose roman representation contains the given letter
+        exactly <count> times """
+        if count == 0:
+            counts = self.symbol_counts[letter.upper()]
+            return array('H', (decimal for decimal in range(Roman._decimal_of(start), Roman._decimal_of(stop) + 1)
+                               if not counts[decimal]))
+
+        return PropertyIndex._between(self._by_symbol_count.get((letter.upper(), count), array('H')), start, stop)
+
+    def with_properties(self, properties: NumeralProperty, start: Union[Roman, str, int] = 0,
+                        stop: Union[Roman, str, int] = tables.MAX_VALUE) -> array:
+        """ Returns the sorted numbers between <start> and <stop> having all the given properties """
+        return self.query(properties=properties, start=start, stop=stop)
+
+    def query(self, length: Optional[int] = None, properties: NumeralProperty = NumeralProperty(0),
+              symbol_counts: Optional[Mapping[str, int]] = None, start: Union[Roman, str, int] = 0,
+              stop: Union[Roman, str, int] = tables.MAX_VALUE) -> array:
+        """ Returns the sorted numbers between <start> and <stop> matching all the given criteria: the length of their
+        roman representation, the properties they must have and the exact number of occurrences of some letters. The
+        smallest group of candidates is chosen first and then filtered using the other criteria """
+        symbol_counts = {letter.upper(): count for letter, count in (symbol_counts or {}).items()}
+
+        candidates = [self._by_property[p] for p in NumeralProperty if properties & p]
+        if length is not None:
+            candidates.append(self._by_length.get(length, array('H')))
+        candidates += [self._by_symbol_count.get(item, array('H')) for item in symbol_counts.items() if item[1]]
+        if not candidates:
+            candidates.append(array('H', range(tables.MAX_VALUE + 1)))
+
+        values = PropertyIndex._between(min(candidates, key=len), start, stop)
+        if properties:
+            values = array('H', [v for v in values if self.properties[v] & properties == properties])
+        if length is not None:
+            values = array('H', [v for v in values if self.lengths[v] == length])
+        for letter, count in symbol_counts.items():
+            counts = self.symbol_counts[letter]
+            values = array('H', [v for v in values if counts[v] == count])
+
+        return values
+
+
+class SubstringIndex:
+    """ Inverted index from the substrings of roman representations to the positions, in a collection, of the numerals
+    containing them. Every substring of up to <gram_size> letters has its own sorted array of positions, so short
+    needles are answered with a single lookup; longer needles intersect the arrays of their substrings, starting with
+    the shortest, and only the remaining candidates are checked against the representations """
+    def __init__(self, numerals: Iterable[Union[Roman, str]] = (), gram_size: int = 3):
+        """ The constructor indexes the given Roman numerals (or roman representations), in order; their positions in
+        the iterable are the values returned by the queries """
+        self.gram_size = gram_size
+        self._romans: List[str] = []
+        self._postings: Dict[str, array] = {}
+        for numeral in numerals:
+            self.add(numeral)
+
+    def __len__(self) -> int:
+        """ Returns the number of indexed numerals """
+        return len(self._romans)
+
+    def add(self, numeral: Union[Roman, str]) -> int:
+        """ Indexes one more Roman numeral (or roman representation) and returns its position """
+        roman = numeral.roman if isinstance(numeral, Roman) else tables.normalize(numeral)
+        position = len(self._romans)
+        self._romans.append(roman)
+
+        grams = {roman[i:i + size] for size in range(1, self.gram_size + 1) for i in range(len(roman) - size + 1)}
+        for gram in grams:
+            self._postings.setdefault(gram, array('L')).append(position)
+
+        return position
+
+    def containing(self, item: str) -> array:
+        """ Returns the sorted positions of the numerals whose roman representation contains the given string, with the
+        same case-insensitive semantics as the *in* operator of the Roman class """
+        if not isinstance(item, str):
+            raise TypeError(f"Substring queries require a string, not {type(item)}")
+
+        item = tables.normalize(item)
+        if not item:
+            return array('L', range(len(self._romans)))
+        if len(item) <= self.gram_size:
+            return array('L', self._postings.get(item, ()))
+
+        grams = {item[i:i + self.gram_size] for i in range(len(item) - self.gram_size + 1)}
+        postings = sorted((self._postings.get(gram, array('L')) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+
+        return array('L', sorted(c for c in candidates if item in self._romans[c]))
+
+
+@tables.derived
+@lru_cache(maxsize=None)
+def property_index() -> PropertyIndex:
+    """ Returns the property index of the domain, which is built the first time it is requested """
+    return PropertyIndex()
+
+
+@tables.derived
+@lru_cache(maxsize=None)
+def substring_index() -> SubstringIndex:
+    """ Returns the substring index of the domain, in which positions are the decimal values of the numerals; it is
+    built the first time it is requested """
+    return SubstringIndex(tables.roman_table())
+
+
+def as_romans(values: Iterable[int]) -> Iterator[Roman]:
+    """ Generator function which lazily turns the numbers returned by the queries into Roman numerals """
+    for value in values:
+        yield Roman(value)
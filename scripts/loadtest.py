@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import math
+import time
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+from scripts.roman import Roman
+
+
+class TimedQueue(asyncio.Queue):
+    """ asyncio.Queue which records the time at which every item is put and measures, when the item is taken out, how
+    long it waited in the queue. Since the queue is FIFO, the n-th item taken is always the n-th item put, whichever
+    producer and consumer handled it. The None sentinels sent by the producers are swallowed, so that the harness can
+    decide when the consumers are stopped """
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.put_times: Deque[float] = collections.deque()
+        self.latencies: List[float] = []
+        self.accept_sentinels = False
+
+    def put_nowait(self, item: Any) -> None:
+        if item is None and not self.accept_sentinels:
+            return
+        super().put_nowait(item)
+        self.put_times.append(time.perf_counter())
+
+    def get_nowait(self) -> Any:
+        item = super().get_nowait()
+        self.latencies.append(time.perf_counter() - self.put_times.popleft())
+        return item
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """ Returns the given percentile (as a fraction between 0 and 1) of the values, using the nearest-rank method """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = math.ceil(fraction * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+async def _sample_depth(queue: asyncio.Queue, interval: float, start: float,
+                        samples: List[Tuple[float, int]]) -> None:
+    """ Records the depth of the queue every <interval> seconds, until cancelled """
+    while True:
+        samples.append((round(time.perf_counter() - start, 6), queue.qsize()))
+        await asyncio.sleep(interval)
+
+
+async def run_load_test(producers: int = 1, consumers: int = 1, queue_size: int = 0, items: int = 1000,
+                        rate: Optional[float] = None, sample_interval: float = 0.01) -> Dict[str, Any]:
+    """ Drives the Roman.producer / Roman.consumer pipeline: <producers> producers each put <items> Roman numbers
+    (cycling over the Fibonacci numbers) into a queue bounded to <queue_size> items (0 = unbounded), at <rate> items
+    per second each (as fast as possible if None), while <consumers> consumers take them out. Returns a report with the
+    throughput, the end-to-end latency percentiles (from put to get, in milliseconds) and the queue depth over time """
+    queue = TimedQueue(queue_size)
+    delay = 1 / rate if rate else 0
+    depth_samples: List[Tuple[float, int]] = []
+
+    start = time.perf_counter()
+    sampler = asyncio.create_task(_sample_depth(queue, sample_interval, start, depth_samples))
+    consumer_tasks = [asyncio.create_task(Roman.consumer(queue, verbose=False)) for _ in range(consumers)]
+    try:
+        numbers = [itertools.islice(itertools.cycle(Roman.fibonacci_numbers()), items) for _ in range(producers)]
+        await asyncio.gather(*(Roman.producer(queue, delay, producer_numbers) for producer_numbers in numbers))
+        queue.accept_sentinels = True
+        for _ in range(consumers):
+            await queue.put(None)
+        consumed = await asyncio.gather(*consumer_tasks)
+    finally:
+        sampler.cancel()
+        for task in consumer_tasks:
+            task.cancel()
+    duration = time.perf_counter() - start
+
+    latencies = queue.latencies[:producers * items]
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        'config': {'producers': producers, 'consumers': consumers, 'queue_size': queue_size, 'items': items,
+                   'rate': rate},
+        'duration_s': duration,
+        'items': len(latencies),
+        'primes_consumed': sum(map(len, consumed)),
+        'throughput_items_per_s': len(latencies) / duration if duration else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies_ms, 0.50),
+            'p95': percentile(latencies_ms, 0.95),
+            'p99': percentile(latencies_ms, 0.99),
+            'max': max(latencies_ms, default=0.0),
+        },
+        'queue_depth': {
+            'max': max((depth for _, depth in depth_samples), default=0),
+            'samples': depth_samples,
+        },
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test for the Roman.producer / Roman.consumer queue pipeline')
+    parser.add_argument('--producers', type=int, default=1)
+    parser.add_argument('--consumers', type=int, default=1)
+    parser.add_argument('--queue-size', type=int, default=0, help='Queue bound; 0 means unbounded')
+    parser.add_argument('--items', type=int, default=1000, help='Number of items put by each producer')
+    parser.add_argument('--rate', type=float, default=None, help='Items per second of each producer; no limit if unset')
+    parser.add_argument('--sample-interval', type=float, default=0.01, help='Seconds between queue depth samples')
+    parser.add_argument('--output', default=None, help='Path of the JSON report; printed to stdout if unset')
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args.producers, args.consumers, args.queue_size, args.items, args.rate,
+                                       args.sample_interval))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,274 @@
+# Optional pandas extension type for Roman numerals. Importing this module requires pandas (and numpy) and registers
+# the "roman" dtype, so that columns can be created with pd.Series([...], dtype='roman')
+import operator
+from typing import Any, Callable, Sequence, Tuple, Type
+from scripts import tables
+from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
+from scripts.roman import Roman
+
+try:
+    import numpy as np
+    import pandas as pd
+    from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype, take
+    from pandas.api.types import is_integer_dtype, is_string_dtype
+except ImportError as e:  # pragma: no cover
+    raise ImportError('The Roman pandas extension type requires pandas to be installed: pip install pandas') from e
+
+
+@register_extension_dtype
+class RomanDtype(ExtensionDtype):
+    """ pandas dtype of the Roman numerals columns, whose values are stored as unsigned 16-bit integers """
+    name = 'roman'
+    type = Roman
+    kind = 'O'
+    na_value = pd.NA
+
+    @classmethod
+    def construct_array_type(cls) -> Type['RomanExtensionArray']:
+        """ Returns the array type associated with this dtype """
+        return RomanExtensionArray
+
+
+class RomanExtensionArray(ExtensionArray):
+    """ pandas extension array of Roman numerals. The decimal values are kept in a uint16 numpy array and missing
+    values are marked in a separate boolean mask, so that sorting, grouping and merging work on plain integers """
+    def __init__(self, values: np.ndarray, mask: np.ndarray, copy: bool = False):
+        """ The constructor wraps already validated decimal values and their missing values mask """
+        self._data = np.array(values, dtype=np.uint16) if copy else np.asarray(values, dtype=np.uint16)
+        self._mask = np.array(mask, dtype=bool) if copy else np.asarray(mask, dtype=bool)
+
+    ### Construction
+    @staticmethod
+    def _coerce(scalars: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """ Converts Roman numerals, their representations or missing values into int64 decimal values and a missing
+        values mask; the decimal values are not validated yet """
+        if isinstance(scalars, RomanExtensionArray):
+            return scalars._data.astype(np.int64), scalars._mask
+        if isinstance(scalars, np.ndarray) and is_integer_dtype(scalars.dtype):
+            return scalars.astype(np.int64), np.zeros(len(scalars), dtype=bool)
+        if isinstance(scalars, (Roman, int, str, np.integer)) or scalars is pd.NA or scalars is None:
+            scalars = [scalars]
+
+        values = np.zeros(len(scalars), dtype=np.int64)
+        mask = np.zeros(len(scalars), dtype=bool)
+        for i, scalar in enumerate(scalars):
+            if scalar is None or scalar is pd.NA or (isinstance(scalar, float) and np.isnan(scalar)):
+                mask[i] = True
+            elif isinstance(scalar, Roman):
+                values[i] = scalar.decimal
+            elif isinstance(scalar, str):
+                values[i] = tables.to_decimal(scalar)
+            elif isinstance(scalar, (int, np.integer)):
+                values[i] = scalar
+            else:
+                message = 'The representation of the Roman numeral must be in str or int format (Given: {})'
+                raise RomanNumeralTypeError(message.format(type(scalar)))
+
+        return values, mask
+
+    @staticmethod
+    def _check_domain(values: np.ndarray, mask: np.ndarray) -> None:
+        """ Raises a RomanNumeralValueError if any of the non-missing values is not a valid Roman numeral """
+        invalid = ((values < 0) | (values > tables.MAX_VALUE)) & ~mask
+        if invalid.any():
+            raise RomanNumeralValueError(Roman.validate(int(values[invalid.argmax()])))
+
+    @classmethod
+    def _from_decimals(cls, values: np.ndarray, mask: np.ndarray) -> 'RomanExtensionArray':
+        """ Builds an array out of int64 decimal values, checking that they are valid Roman numerals """
+        cls._check_domain(values, mask)
+        return cls(np.where(mask, 0, values), mask)
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy: bool = False) -> 'RomanExtensionArray':
+        """ Builds an array out of a sequence of Roman numerals, their representations or missing values """
+        return cls._from_decimals(*cls._coerce(scalars))
+
+    @classmethod
+    def _from_sequence_of_strings(cls, strings, *, dtype=None, copy: bool = False) -> 'RomanExtensionArray':
+        """ Parses an array out of a sequence of roman representations (used, e.g., by read_csv) """
+        return cls._from_sequence(strings)
+
+    @classmethod
+    def _from_factorized(cls, values: np.ndarray, original: 'RomanExtensionArray') -> 'RomanExtensionArray':
+        """ Rebuilds an array out of the unique values returned by _values_for_factorize """
+        return cls(np.where(values < 0, 0, values), values < 0)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat: Sequence['RomanExtensionArray']) -> 'RomanExtensionArray':
+        """ Concatenates several arrays """
+        return cls(np.concatenate([array._data for array in to_concat]),
+                   np.concatenate([array._mask for array in to_concat]))
+
+    ### Array interface
+    @property
+    def dtype(self) -> RomanDtype:
+        return RomanDtype()
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes + self._mask.nbytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, item):
+        """ Returns a Roman numeral (or pd.NA) for scalar indexers and a new array otherwise """
+        if isinstance(item, (int, np.integer)):
+            return pd.NA if self._mask[item] else Roman(int(self._data[item]))
+
+        item = pd.api.indexers.check_array_indexer(self, item)
+        return RomanExtensionArray(self._data[item], self._mask[item])
+
+    def __setitem__(self, key, value) -> None:
+        """ Replaces the values at the given positions, validating the new values """
+        key = pd.api.indexers.check_array_indexer(self, key)
+        values, mask = RomanExtensionArray._coerce(value)
+        RomanExtensionArray._check_domain(values, mask)
+        if len(values) == 1:
+            values, mask = values[0], mask[0]
+        self._data[key] = np.where(mask, 0, values)
+        self._mask[key] = mask
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def isna(self) -> np.ndarray:
+        return self._mask.copy()
+
+    def copy(self) -> 'RomanExtensionArray':
+        return RomanExtensionArray(self._data, self._mask, copy=True)
+
+    def take(self, indices, allow_fill: bool = False, fill_value=None) -> 'RomanExtensionArray':
+        """ Takes the values at the given positions; with <allow_fill>, -1 positions are filled with <fill_value> """
+        if allow_fill and fill_value is not None and fill_value is not pd.NA:
+            fill, fill_mask = RomanExtensionArray._coerce(fill_value)
+            RomanExtensionArray._check_domain(fill, fill_mask)
+            data = take(self._data, indices, allow_fill=True, fill_value=int(fill[0]))
+            mask = take(self._mask, indices, allow_fill=True, fill_value=False)
+        else:
+            data = take(self._data, indices, allow_fill=allow_fill, fill_value=0)
+            mask = take(self._mask, indices, allow_fill=allow_fill, fill_value=True)
+
+        return RomanExtensionArray(data, mask)
+
+    def _values_for_factorize(self) -> Tuple[np.ndarray, int]:
+        """ Groupby, merge and unique operate on the int64 decimal values, with -1 marking missing values """
+        return np.where(self._mask, -1, self._data.astype(np.int64)), -1
+
+    def _values_for_argsort(self) -> np.ndarray:
+        """ Sorting operates on the decimal values """
+        return self._data
+
+    ### Conversion
+    def to_strings(self) -> np.ndarray:
+        """ Returns the roman representations of the values, as an object array, with None for missing values """
+        strings = np.array(tables.roman_table() + (None,), dtype=object)
+        return strings[np.where(self._mask, len(strings) - 1, self._data)]
+
+    def astype(self, dtype, copy: bool = True):
+        """ Supports conversions to string dtypes (giving the roman representations) and to integer dtypes (giving the
+        decimal values, if there are no missing values), on top of the default conversions """
+        dtype = pd.api.types.pandas_dtype(dtype)
+        if isinstance(dtype, RomanDtype):
+            return self.copy() if copy else self
+        if is_string_dtype(dtype) and dtype != np.dtype(object):
+            return pd.array(self.to_strings(), dtype=dtype) if isinstance(dtype, ExtensionDtype) \
+                else self.to_strings().astype(dtype)
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iuf':
+            if self._mask.any():
+                raise ValueError('Cannot convert Roman numerals with missing values to a numpy numeric dtype')
+            return self._data.astype(dtype)
+
+        return super().astype(dtype, copy=copy)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """ Converts the array to an object numpy array of Roman numerals (and pd.NA) """
+        return np.array(list(self), dtype=object)
+
+    ### Reductions
+    def _reduce(self, name: str, *, skipna: bool = True, keepdims: bool = False, **kwargs):
+        """ Supports the min, max and sum reductions on the decimal values; the domain of the sum is checked once. The
+        result is pd.NA if missing values are not skipped, or if there are not enough values left to reduce """
+        if name not in ('min', 'max', 'sum'):
+            return super()._reduce(name, skipna=skipna, keepdims=keepdims, **kwargs)
+
+        values = self._data[~self._mask]
+        min_count = kwargs.get('min_count', 0) if name == 'sum' else 1
+        if (self._mask.any() and not skipna) or len(values) < min_count:
+            result: Any = pd.NA
+        elif name == 'sum':
+            total = np.array([values.sum(dtype=np.int64)])
+            RomanExtensionArray._check_domain(total, np.zeros(1, dtype=bool))
+            result = Roman(int(total[0]))
+        else:
+            result = Roman(int(getattr(values, name)()))
+
+        return RomanExtensionArray._from_sequence([result]) if keepdims else result
+
+    ### Arithmetic and comparison operators
+    def _arith(self, other, function: Callable[[Any, Any], Any], reflected: bool = False) -> 'RomanExtensionArray':
+        """ Applies an arithmetic operation on the int64 decimal values and checks the domain of the results once """
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        values, mask = RomanExtensionArray._coerce(other)
+        left, right = (values, self._data.astype(np.int64)) if reflected else (self._data.astype(np.int64), values)
+        mask = self._mask | mask
+
+        if function in (operator.floordiv, operator.mod) and ((right == 0) & ~mask).any():
+            raise ZeroDivisionError('integer division or modulo by zero')
+
+        with np.errstate(divide='ignore'):
+            return RomanExtensionArray._from_decimals(function(left, np.where(mask, 1, right)), mask)
+
+    def _compare(self, other, function: Callable[[Any, Any], Any]):
+        """ Applies a comparison on the decimal values, returning a nullable boolean array """
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        values, mask = RomanExtensionArray._coerce(other)
+        mask = self._mask | mask
+
+        return pd.arrays.BooleanArray(function(self._data.astype(np.int64), values) & ~mask, mask)
+
+    def __add__(self, other):
+        return self._arith(other, operator.add)
+
+    def __radd__(self, other):
+        return self._arith(other, operator.add, reflected=True)
+
+    def __sub__(self, other):
+        return self._arith(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self._arith(other, operator.sub, reflected=True)
+
+    def __mul__(self, other):
+        return self._arith(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self._arith(other, operator.mul, reflected=True)
+
+    def __floordiv__(self, other):
+        return self._arith(other, operator.floordiv)
+
+    def __mod__(self, other):
+        return self._arith(other, operator.mod)
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
@@ -0,0 +1,133 @@
+from typing import List, Optional, Set, Tuple
+from scripts import tables
+from scripts.enums import RomanNumeral
+from scripts.exceptions import RomanNumeralValueError
+
+
+# Byte classes; Roman letters are classified by their rank in the RomanNumeral enumeration (N = 0, ..., M = 7)
+DELIMITER = -1
+INVALID = -2
+LETTERS = [r.name for r in RomanNumeral]
+SUBTRACTIVE_RANKS = frozenset(LETTERS.index(letter) for letter in 'IXC')
+REPEATABLE_RANKS = frozenset(LETTERS.index(letter) for letter in 'IXCM')
+
+ParseResult = Tuple[int, Tuple[int, int]]
+
+
+class IncrementalParser:
+    """ Push-style parser for Roman numerals delivered in arbitrarily sized chunks of bytes. Numerals are separated by
+    delimiter bytes and may straddle chunk boundaries. Each byte is inspected exactly once: the validation rules of
+    Roman.validate are tracked incrementally, so a numeral is already validated when its closing delimiter arrives.
+    Completed numerals are reported as (decimal value, (start offset, end offset)) tuples, the offsets being counted
+    from the beginning of the stream """
+    def __init__(self, delimiters: bytes = b' \t\r\n,;', errors: str = 'raise'):
+        """ The constructor builds the byte classification table. The <errors> policy decides what happens to invalid
+        numerals: 'raise' raises a RomanNumeralValueError when the numeral ends, 'skip' silently drops it """
+        if errors not in ('raise', 'skip'):
+            raise ValueError(f"The errors policy must be 'raise' or 'skip' (Given: {errors!r})")
+
+        self.errors = errors
+        self._classes = [INVALID] * 256
+        for rank, letter in enumerate(LETTERS):
+            self._classes[ord(letter)] = self._classes[ord(letter.lower())] = rank
+        for delimiter in delimiters:
+            self._classes[delimiter] = DELIMITER
+
+        self._offset = 0
+        self._pending = b''
+        self._results: List[ParseResult] = []
+        self._reset_token()
+
+    def _reset_token(self) -> None:
+        """ Clears the state of the numeral currently being parsed """
+        self._token = bytearray()
+        self._token_start: Optional[int] = None
+        self._previous: Optional[int] = None
+        self._run_length = 0
+        self._invalid_characters: Set[str] = set()
+        self._error: Optional[str] = None
+
+    def _push(self, byte: int, rank: int) -> None:
+        """ Adds a byte to the numeral currently being parsed, applying the validation rules of Roman.validate on the
+        pair formed with the previous letter """
+        if self._token_start is None:
+            self._token_start = self._offset
+
+        if rank == INVALID:
+            self._invalid_characters.add(chr(byte).upper())
+            self._previous = None
+            return
+
+        self._token.append(byte & ~0x20)  # ASCII uppercase
+        previous = self._previous
+        if previous is not None and self._error is None:
+            letter = LETTERS[previous]
+            if previous < rank and previous not in SUBTRACTIVE_RANKS:
+                message = 'Only "I", "X" and "C" can be used as subtractive numerals (Used "{}")'
+                self._error = message.format(letter)
+            elif previous == rank and previous not in REPEATABLE_RANKS:
+                message = 'Only "I", "X", "C" and "M" can be repeated in succession (Repeated "{}")'
+                self._error = message.format(letter)
+            elif previous == rank and self._run_length == 3:
+                message = 'Characters cannot be repeated more than 3 times in one succession ' \
+                          '(Repeated "{}" too many times)'
+                self._error = message.format(letter)
+
+        self._run_length = self._run_length + 1 if previous == rank else 1
+        self._previous = rank
+
+    def _end_token(self) -> None:
+        """ Completes the numeral currently being parsed, converting it if it is valid """
+        message = self._error
+        if self._invalid_characters:
+            message = 'The string representation provided contains invalid characters: {}'
+            message = message.format(self._invalid_characters)
+        elif message is None:
+            span = (self._token_start or 0, self._offset)
+            self._results.append((tables.to_decimal(self._token.decode('ascii')), span))
+        self._reset_token()
+
+        if message is not None and self.errors == 'raise':
+            raise RomanNumeralValueError(message)
+
+    def _parse(self, data: bytes) -> List[ParseResult]:
+        """ Runs the bytes through the parser and returns the numerals completed so far. When an invalid numeral
+        raises, the bytes following it are kept and parsed on the next call, together with the results already
+        completed before it """
+        data = self._pending + data
+        self._pending = b''
+        classes = self._classes
+
+        for i, byte in enumerate(data):
+            rank = classes[byte]
+            if rank == DELIMITER:
+                if self._token_start is not None:
+                    try:
+                        self._end_token()
+                    except RomanNumeralValueError:
+                        self._offset += 1
+                        self._pending = data[i + 1:]
+                        raise
+            else:
+                self._push(byte, rank)
+            self._offset += 1
+
+        results, self._results = self._results, []
+        return results
+
+    def feed(self, data: bytes) -> List[ParseResult]:
+        """ Parses a new chunk of the stream and returns the numerals whose closing delimiter was found in it """
+        return self._parse(bytes(data))
+
+    def finish(self) -> List[ParseResult]:
+        """ Signals the end of the stream, returning the remaining numerals, including the last one, which does not
+        need a closing delimiter. The parser can then be reused for a new stream """
+        self._results = self._parse(b'')
+        try:
+            if self._token_start is not None:
+                self._end_token()
+        finally:
+            self._offset = 0
+
+        results, self._results = self._results, []
+        return results
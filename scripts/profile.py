@@ -0,0 +1,88 @@
+import argparse
+import cProfile
+import os
+import pstats
+import runpy
+import sys
+from typing import Dict, List, Tuple
+from scripts import tracing
+
+
+Function = Tuple[str, int, str]
+
+
+def _frame(function: Function) -> str:
+    """ Returns the name of a stack frame, as shown in the flame graphs (without semicolons, which separate frames) """
+    filename, line, name = function
+    if filename == '~':
+        return name.replace(';', ',')
+
+    return f'{name} ({os.path.basename(filename)}:{line})'.replace(';', ',')
+
+
+def collapsed_stacks(stats: pstats.Stats, min_microseconds: int = 1) -> List[str]:
+    """ Converts the statistics of cProfile into collapsed stacks ("frame;frame;frame microseconds" lines), the input
+    format of flamegraph.pl and speedscope. cProfile only records the caller-callee pairs, so the stacks are rebuilt by
+    walking the call graph from its roots; the time of a function called from several places is split between them in
+    proportion to the time recorded for each caller, and recursive calls are folded into their first occurrence """
+    entries = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[Function, Dict[Function, float]] = {function: {} for function in entries}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = cumulative
+
+    totals: Dict[str, float] = {}
+    roots = [(function, [function], entries[function][3]) for function, entry in entries.items() if not entry[4]]
+    stack = roots[::-1]
+    while stack:
+        function, path, weight = stack.pop()
+        _, _, own_time, cumulative, _ = entries[function]
+        scale = weight / cumulative if cumulative else 0.0
+
+        key = ';'.join(map(_frame, path))
+        totals[key] = totals.get(key, 0.0) + own_time * scale
+        for callee, callee_time in callees.get(function, {}).items():
+            if callee not in path and callee_time * scale * 1e6 >= min_microseconds:
+                stack.append((callee, path + [callee], callee_time * scale))
+
+    microseconds = {key: round(seconds * 1e6) for key, seconds in totals.items()}
+    return [f'{key} {value}' for key, value in microseconds.items() if value >= min_microseconds]
+
+
+def profile_workload(path: str, trace: bool = False) -> Tuple[pstats.Stats, List[str], str]:
+    """ Runs a workload script (as __main__) under cProfile and returns the statistics, their collapsed stacks and,
+    with <trace>, the branch report of Roman.validate and Roman.convert_to_decimal (an empty string otherwise) """
+    profiler = cProfile.Profile()
+    report = ''
+    if trace:
+        with tracing.trace() as tracer:
+            profiler.runcall(runpy.run_path, path, run_name='__main__')
+        report = tracer.format_report()
+    else:
+        profiler.runcall(runpy.run_path, path, run_name='__main__')
+
+    stats = pstats.Stats(profiler)
+    return stats, collapsed_stacks(stats), report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Profiles a workload script using Roman numerals, writing the profile '
+                                                 'as collapsed stacks (the input of flamegraph.pl and speedscope)')
+    parser.add_argument('workload', help='Path of the Python script to profile')
+    parser.add_argument('--output', default=None, help='Path of the collapsed stacks; printed to stdout if unset')
+    parser.add_argument('--pstats', default=None, help='Path where the raw cProfile statistics are also dumped')
+    parser.add_argument('--trace', action='store_true',
+                        help='Also record the branches taken inside Roman.validate and Roman.convert_to_decimal and '
+                             'print their hit counts and timings to stderr')
+    args = parser.parse_args()
+
+    stats, stacks, report = profile_workload(args.workload, args.trace)
+    if args.pstats:
+        stats.dump_stats(args.pstats)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(stacks) + '\n')
+    else:
+        print('\n'.join(stacks))
+    if report:
+        print(report, file=sys.stderr)
@@ -1,9 +1,16 @@
 import asyncio
+import collections
+import functools
 import itertools
-from typing import Iterator, List, Union
-from scripts.enums import RomanNumeral
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from scripts import snapshot, tables, tracing
+from scripts.enums import RomanNumeral, ValidationPolicy
 from scripts.exceptions import RomanNumeralValueError, RomanNumeralTypeError
 
+if TYPE_CHECKING:
+    from scripts.expressions import RomanExpression
+
 
 ### User-defined decorator function
 def validated(fn):
@@ -12,17 +19,107 @@ def validated(fn):
     and returns a value of type Union[str, int]. The decorator will wrap the function and check if the provided
     representation is valid before calling the wrapped function. If the representation is invalid, a
     RomanNumeralValueError exception will be raised. If the representation is valid, the wrapped function will be
-    called with the representation as a parameter. The decorator will return the wrapped function."""
-    def wrapper(representation: Union[str, int]):
+    called with the representation as a parameter, followed by any other arguments it received. The decorator will
+    return the wrapped function."""
+    def wrapper(representation: Union[str, int], *args, **kwargs):
         validation_result = Roman.validate(representation)
         if validation_result == 'OK':
-            return fn(representation)
+            return fn(representation, *args, **kwargs)
         else:
             raise RomanNumeralValueError(validation_result)
 
     return wrapper
 
 
+def validate_batch(representations: Iterable[Union[str, int]]) -> Tuple[List[Union[str, int]],
+                                                                          List[Tuple[int, Union[str, int], str]]]:
+    """ Validates a batch of representations in one pass, returning the valid ones (in order) and, for the invalid
+    ones, their position in the batch, the representation itself and the message of Roman.validate. Integers in the
+    domain and canonical strings are recognized with plain range and table lookups; Roman.validate is only called for
+    the remaining representations (lowercase, Unicode, non-canonical or invalid ones) """
+    canonical = tables.decimal_table()
+    valid: List[Union[str, int]] = []
+    errors: List[Tuple[int, Union[str, int], str]] = []
+
+    for position, representation in enumerate(representations):
+        if type(representation) is int and 0 <= representation <= tables.MAX_VALUE \
+                or isinstance(representation, str) and representation in canonical:
+            valid.append(representation)
+            continue
+
+        validation_result = Roman.validate(representation)
+        if validation_result == 'OK':
+            valid.append(representation)
+        else:
+            errors.append((position, representation, validation_result))
+
+    return valid, errors
+
+
+def batch_validated(policy: ValidationPolicy = ValidationPolicy.RAISE) -> Callable[[Callable], Callable]:
+    """ Companion of the validated decorator, for functions taking an iterable of roman numeral representations as the
+    first parameter. The whole batch is validated with validate_batch before calling the wrapped function, which then
+    receives the list of valid representations, followed by any other arguments. The <policy> decides what happens to
+    the invalid representations: with RAISE, a RomanNumeralValueError is raised for the first one (and the function is
+    not called); with FILTER, they are dropped; with PARTITION, they are dropped and the decorated function returns a
+    (result, errors) tuple, where errors is the list of (position, representation, message) tuples of the batch """
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(representations: Iterable[Union[str, int]], *args, **kwargs) -> Any:
+            valid, errors = validate_batch(representations)
+            if errors and policy is ValidationPolicy.RAISE:
+                raise RomanNumeralValueError(errors[0][2])
+
+            result = fn(valid, *args, **kwargs)
+            return (result, errors) if policy is ValidationPolicy.PARTITION else result
+
+        return wrapper
+
+    return decorator
+
+
+def _is_expression(value: object) -> bool:
+    """ Checks whether a value is a lazy RomanExpression, which handles the arithmetic operators with Roman numerals
+    through its reflected operators """
+    from scripts.expressions import RomanExpression
+    return isinstance(value, RomanExpression)
+
+
+def _rehydrate(decimal: int) -> 'Roman':
+    """ Rebuilds a Roman numeral out of its decimal value when unpickling. Values in the domain are looked up in the
+    precomputed table, skipping the validation and conversion of the constructor; anything else is delegated to the
+    constructor, which raises the appropriate error. Instances are not shared, since Roman numerals are mutable """
+    if not isinstance(decimal, int) or not 0 <= decimal <= tables.MAX_VALUE:
+        return Roman(decimal)
+
+    numeral = Roman.__new__(Roman)
+    numeral.roman = tables.roman_table()[decimal]
+    numeral.decimal = decimal
+    numeral.iter_idx = 0
+    return numeral
+
+
+def _convert_batch(batch: List[Union[str, int]]) -> List[Union[str, int]]:
+    """ Converts a batch of representations to the other representation (decimal numbers to Roman numerals and the
+    other way around). It is defined at module level so that it can be sent to process pools """
+    return [tables.to_roman(value) if isinstance(value, int) else tables.to_decimal(value) for value in batch]
+
+
+@functools.lru_cache(maxsize=None)
+def _fibonacci_table() -> Tuple[Tuple['Roman', ...], Dict[int, int]]:
+    """ Computes, once, the Fibonacci numbers which are valid Roman numerals, as cached Roman instances, together with
+    a mapping from each of their decimal values to its (first) index in the sequence """
+    decimals = [1, 1]
+    while decimals[-2] + decimals[-1] <= tables.MAX_VALUE:
+        decimals.append(decimals[-2] + decimals[-1])
+
+    indexes: Dict[int, int] = {}
+    for index, decimal in enumerate(decimals):
+        indexes.setdefault(decimal, index)
+
+    return tuple(Roman(decimal) for decimal in decimals), indexes
+
+
 class Roman:
     """ Class which implements support for and arithmetic operations with Roman Numerals """
     def __init__(self, representation: Union[str, int] = 'N'):
@@ -34,7 +131,7 @@ class Roman:
         if validation_result == 'OK':
             # Convert it and set fields
             if isinstance(representation, str):
-                self.roman = representation.upper()
+                self.roman = tables.normalize(representation)
                 self.decimal = Roman.convert_to_decimal(representation)
             elif isinstance(representation, int):
                 self.roman = Roman.convert_to_roman(representation)
@@ -78,6 +175,12 @@ class Roman:
         and dict. Without implementing this, Roman numbers will not be usable as items in hashable collections """
         return hash(self.decimal)
 
+    ### Serialization methods
+    def __reduce__(self) -> Tuple[Callable[[int], 'Roman'], Tuple[int]]:
+        """ Makes pickling store only the decimal value of the Roman numeral, instead of the whole instance dictionary.
+        The roman representation is rebuilt from the decimal value when unpickling """
+        return _rehydrate, (self.decimal,)
+
     ### Arithmetic operators
     def __add__(self, other) -> 'Roman':
         """ Implements the left-sided addition for Roman numerals """
@@ -87,6 +190,8 @@ class Roman:
             return Roman(self.decimal + other)
         elif isinstance(other, str):
             return Roman(self.decimal + Roman(other).decimal)
+        elif _is_expression(other):
+            return NotImplemented
         else:
             raise TypeError(f'Roman numeral addition requires str, int or Roman as right operand, not {type(other)}')
 
@@ -103,6 +208,8 @@ class Roman:
             return Roman(self.decimal - other)
         elif isinstance(other, str):
             return Roman(self.decimal - Roman(other).decimal)
+        elif _is_expression(other):
+            return NotImplemented
         else:
             raise TypeError(f'Roman numeral subtraction requires str, int or Roman as right operand, not {type(other)}')
 
@@ -114,6 +221,8 @@ class Roman:
             return Roman(self.decimal * other)
         elif isinstance(other, str):
             return Roman(self.decimal * Roman(other).decimal)
+        elif _is_expression(other):
+            return NotImplemented
         else:
             raise TypeError(f'Roman numeral multiplication requires str, int or Roman as right operand, not {type(other)}')
 
@@ -130,6 +239,8 @@ class Roman:
             return Roman(self.decimal // other)
         elif isinstance(other, str):
             return Roman(self.decimal // Roman(other).decimal)
+        elif _is_expression(other):
+            return NotImplemented
         else:
             raise TypeError(f'Roman numeral division requires str, int or Roman as right operand, not {type(other)}')
 
@@ -141,9 +252,19 @@ class Roman:
             return Roman(self.decimal % other)
         elif isinstance(other, str):
             return Roman(self.decimal % Roman(other).decimal)
+        elif _is_expression(other):
+            return NotImplemented
         else:
             raise TypeError(f'Roman numeral modulus requires str, int or Roman as right operand, not {type(other)}')
 
+    ### Lazy arithmetic
+    @staticmethod
+    def expr(representation: Union['Roman', str, int]) -> 'RomanExpression':
+        """ Starts a lazy arithmetic expression (e.g. (Roman.expr(a) + b) * c - d), which is evaluated with plain
+        integers by its evaluate() method, validating and converting only the final result """
+        from scripts.expressions import RomanExpression
+        return RomanExpression.of(representation)
+
     ### Comparison operators
     def __lt__(self, other) -> bool:
         """ Implements < comparison between Roman numerals """
@@ -176,7 +297,16 @@ class Roman:
         return not self < other
 
     def __eq__(self, other) -> bool:
-        """ Implements equality testing between Roman numerals """
+        """ Implements equality testing between Roman numerals. Integers (the most frequent operands, e.g. when Roman
+        numerals and integers are mixed as dict keys) are compared directly and strings are looked up in the conversion
+        tables, without building intermediate Roman numerals """
+        if type(other) is int:
+            return self.decimal == other
+        elif isinstance(other, Roman):
+            return self.decimal == other.decimal
+        elif isinstance(other, str):
+            return self.decimal == tables.to_decimal(other)
+
         return not self < other and not self > other
 
     def __ne__(self, other) -> bool:
@@ -186,7 +316,7 @@ class Roman:
     def __contains__(self, item) -> bool:
         """ Enables membership testing for the *in* and *not in* operators """
         if isinstance(item, str):
-            return item.upper() in self.roman
+            return tables.normalize(item) in self.roman
         else:
             raise TypeError(f"'in <Roman>' requires string as left operand, not {type(item)}")
 
@@ -217,12 +347,18 @@ class Roman:
         the supported ones. Then it is verified that only I, X and C are followed by larger letters and that only I, X,
         C and M are repeated in succession, no more than three times in each succession. In the case of integer
         representations, it is checked whether the representation is a non-negative number, no bigger than 3999 (the
-        maximum Roman numeral) """
+        maximum Roman numeral). Unicode Roman numerals (U+2160 - U+2188) are translated to ASCII before the checks. The
+        branches taken are recorded while the tracing mode (scripts.tracing) is enabled """
+        tracer = tracing.active
         if isinstance(representation, str):
-            representation = representation.upper()
+            if tracer:
+                tracer.hit('validate.normalize')
+            representation = tables.normalize(representation)
             roman_characters = [r.name for r in RomanNumeral]
 
             # Check if only the required characters are present
+            if tracer:
+                tracer.hit('validate.characters')
             character_set_difference = set(representation).difference(set(roman_characters))
             if character_set_difference != set():
                 message = 'The string representation provided contains invalid characters: {}'
@@ -234,6 +370,8 @@ class Roman:
                     successor = representation[i + 1]
 
                     # Check if current character is succeeded by a bigger character
+                    if tracer:
+                        tracer.hit('validate.subtractive')
                     if roman_characters.index(current) < roman_characters.index(successor) and \
                             current not in ['I', 'X', 'C']:
                         message = 'Only "I", "X" and "C" can be used as subtractive numerals (Used "{}")'
@@ -241,6 +379,8 @@ class Roman:
 
                     # Check if the current character is repeated in succession
                     if current == successor:
+                        if tracer:
+                            tracer.hit('validate.repetition')
                         if current not in ['I', 'X', 'C', 'M']:
                             message = 'Only "I", "X", "C" and "M" can be repeated in succession (Repeated "{}")'
                             return message.format(current)
@@ -251,6 +391,8 @@ class Roman:
 
             return 'OK'
         elif isinstance(representation, int):
+            if tracer:
+                tracer.hit('validate.int')
             if representation < 0:
                 message = f'Negative Roman numerals do not exist; conversion is impossible (Provided {representation})'
             elif representation > 3999:
@@ -266,12 +408,18 @@ class Roman:
     @validated
     @staticmethod
     def convert_to_decimal(roman_number: str) -> int:
-        """ Converts the given Roman numeral to the coresponding decimal value """
-        roman_number = roman_number.upper()
+        """ Converts the given Roman numeral to the coresponding decimal value. The branches taken are recorded while
+        the tracing mode (scripts.tracing) is enabled """
+        tracer = tracing.active
+        if tracer:
+            tracer.hit('decimal.normalize')
+        roman_number = tables.normalize(roman_number)
         decimal_number = 0
         i = 0
 
         while i < len(roman_number):
+            if tracer:
+                tracer.hit('decimal.lookup')
             current = RomanNumeral[roman_number[i]].value
 
             if i < len(roman_number) - 1:
@@ -280,15 +428,21 @@ class Roman:
 
                 if current < succesor:
                     # If succesor is greater, subtract current from succesor and store the result
+                    if tracer:
+                        tracer.hit('decimal.subtractive')
                     decimal_number += (succesor - current)
                     i += 1  # Skipping the succesor
                 elif current > succesor:
                     # If succesor is smaller, add all smaller occurences to
                     # current and store the result; only do this if the succesor isn't
                     # a subtractive numeral
+                    if tracer:
+                        tracer.hit('decimal.descending')
                     decimal_number += current
 
                     while succesor < current and (i + 1) < len(roman_number) - 1:
+                        if tracer:
+                            tracer.hit('decimal.descending.lookahead')
                         if RomanNumeral[roman_number[i + 2]].value <= succesor:
                             decimal_number += succesor
                             i += 1
@@ -297,6 +451,8 @@ class Roman:
                             break
                 else:
                     # If succesor is same, then add up all repeated occurences and store the result
+                    if tracer:
+                        tracer.hit('decimal.repeated')
                     decimal_number += (current * 2)
                     i += 1
                     if (i + 1) < len(roman_number) - 1:
@@ -306,6 +462,8 @@ class Roman:
                             i += 1
             else:
                 # We are at the last character in the representation
+                if tracer:
+                    tracer.hit('decimal.last')
                 decimal_number += current
 
             i += 1
@@ -314,8 +472,12 @@ class Roman:
 
     @validated
     @staticmethod
-    def convert_to_roman(decimal_number: int) -> str:
-        """ Converts the given decimal number to the coresponding Roman numeral """
+    def convert_to_roman(decimal_number: int, unicode: bool = False) -> str:
+        """ Converts the given decimal number to the coresponding Roman numeral. With <unicode>, the numeral is written
+        with the Unicode Roman numerals (U+2160 - U+216F), taken from a prebuilt table """
+        if unicode:
+            return tables.unicode_table()[decimal_number]
+
         if decimal_number == 0:
             roman_representation = 'N'
         else:
@@ -355,6 +517,20 @@ class Roman:
 
         return roman_representation
 
+    @staticmethod
+    def _decimal_of(representation: Union['Roman', str, int]) -> int:
+        """ Returns the decimal value of a Roman numeral or of one of its representations, validating the latter """
+        if isinstance(representation, Roman):
+            return representation.decimal
+        elif isinstance(representation, str):
+            return tables.to_decimal(representation)
+
+        validation_result = Roman.validate(representation)
+        if validation_result != 'OK':
+            raise RomanNumeralValueError(validation_result)
+
+        return representation
+
     ### User-defined Generators
     @staticmethod
     def roman_generator() -> Iterator['Roman']:
@@ -364,16 +540,29 @@ class Roman:
 
     @staticmethod
     def fibonacci_generator() -> Iterator['Roman']:
-        """ Generator function which generates the Roman Fibonacci numbers """
-        a, b = Roman(1), Roman(1)
+        """ Generator function which generates the Roman Fibonacci numbers, walking over the cached sequence """
+        yield from Roman.fibonacci_numbers()
 
-        while True:
-            yield a
-            if a.decimal + b.decimal < 4000:
-                a, b = b, a + b
-            else:
-                yield b
-                break
+    @staticmethod
+    def fibonacci_numbers() -> Tuple['Roman', ...]:
+        """ Returns the Roman Fibonacci numbers (1, 1, 2, 3, ..., 2584), computed only once and shared between all the
+        callers. The returned Roman instances are cached and must not be modified """
+        return _fibonacci_table()[0]
+
+    @staticmethod
+    def is_fibonacci(representation: Union['Roman', str, int]) -> bool:
+        """ Checks, in constant time, whether the given Roman numeral (or representation) is a Fibonacci number """
+        return Roman._decimal_of(representation) in _fibonacci_table()[1]
+
+    @staticmethod
+    def fibonacci_index(representation: Union['Roman', str, int]) -> int:
+        """ Returns, in constant time, the index of the given Roman numeral (or representation) in the sequence of
+        Fibonacci numbers. For 1, which appears twice, the first index is returned """
+        decimal = Roman._decimal_of(representation)
+        try:
+            return _fibonacci_table()[1][decimal]
+        except KeyError:
+            raise ValueError(f'{decimal} is not a Fibonacci number') from None
 
     @staticmethod
     def prime_generator() -> Iterator['Roman']:
@@ -396,16 +585,52 @@ class Roman:
 
     ### User-defined Coroutines
     @staticmethod
-    async def producer(queue: asyncio.Queue) -> None:
-        ''' Produce Roman Fibonacci numbers and put them into a queue'''
-        for number in Roman.fibonacci_generator():
+    async def aconvert_many(values: Iterable[Union[str, int]], executor: Optional[Executor] = None,
+                            batch_size: int = 1024, max_pending: int = 4) -> AsyncIterator[Union[str, int]]:
+        """ Asynchronous generator which converts the given representations to the other representation without
+        blocking the event loop. The values are split in batches of <batch_size>, which are converted in the given
+        executor (a thread or process pool; the default executor of the loop if None), with at most <max_pending>
+        batches in flight. The results are yielded in order; closing or cancelling the generator cancels the pending
+        batches """
+        if batch_size < 1 or max_pending < 1:
+            message = 'The batch size and the number of pending batches must be positive (Given: {} and {})'
+            raise ValueError(message.format(batch_size, max_pending))
+
+        loop = asyncio.get_running_loop()
+        iterator = iter(values)
+        pending: collections.deque = collections.deque()
+
+        def submit() -> bool:
+            batch = list(itertools.islice(iterator, batch_size))
+            if batch:
+                pending.append(loop.run_in_executor(executor, _convert_batch, batch))
+            return bool(batch)
+
+        try:
+            while len(pending) < max_pending and submit():
+                pass
+
+            while pending:
+                results = await pending.popleft()
+                submit()
+                for result in results:
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    async def producer(queue: asyncio.Queue, delay: float = 0.5, numbers: Optional[Iterable['Roman']] = None) -> None:
+        ''' Produce Roman numbers (the Fibonacci numbers by default) and put them into a queue, waiting <delay> seconds
+        after each one '''
+        for number in Roman.fibonacci_generator() if numbers is None else numbers:
             await queue.put(number)
-            await asyncio.sleep(0.5)  # Simulate I/O-bound operation
+            await asyncio.sleep(delay)  # Simulate I/O-bound operation
         await queue.put(None)  # Signal to the consumer that the producer is done
 
     @staticmethod
-    async def consumer(queue: asyncio.Queue) -> List['Roman']:
-        ''' Consume Roman numbers from a queue and print them if they are prime '''
+    async def consumer(queue: asyncio.Queue, verbose: bool = True) -> List['Roman']:
+        ''' Consume Roman numbers from a queue and print them (if <verbose>) if they are prime '''
         roman_primes = list(Roman.prime_generator())
         consumed_primes = []
 
@@ -415,7 +640,12 @@ class Roman:
             if number is None:
                 break
             if number in roman_primes:
-                print(f'Consumed Roman prime: {number}')
+                if verbose:
+                    print(f'Consumed Roman prime: {number}')
                 consumed_primes.append(number)
 
         return consumed_primes
+
+
+### Conversion tables snapshot, which spares the computation of the tables in every new process
+snapshot.autoload()
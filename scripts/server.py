@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import collections
+import itertools
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple, Union
+from scripts import tables
+from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
+from scripts.roman import Roman
+
+
+# Line protocol: every request is a line made of a command followed by the space-separated values to process, and is
+# answered by a line made of "OK" followed by the results, in the same order, or by "ERR" followed by an error message.
+# Requests can be pipelined; the responses are sent back in the order in which the requests were received. Connections
+# over the server limit are answered by a single line made of "BUSY" followed by an error message, then closed
+ENCODING = 'ascii'
+LINE_LIMIT = 1 << 22  # Maximum length of a line, allowing large batches of values in a single request
+# Maximum number of values sent by the client in a single request line. Values are at most 15 characters long in both
+# representations, so neither the request nor its response (including the command or status) can exceed the line limit
+BATCH_LIMIT = LINE_LIMIT // 16 - 1
+
+
+def _validate(value: str) -> str:
+    """ Validates a representation received as text, which is treated as a decimal number if it parses as one """
+    try:
+        representation: Union[str, int] = int(value)
+    except ValueError:
+        representation = value
+
+    return '1' if Roman.validate(representation) == 'OK' else '0'
+
+
+COMMANDS: Dict[str, Callable[[str], str]] = {
+    'ROMAN': lambda value: tables.to_roman(int(value)),
+    'DECIMAL': lambda value: str(tables.to_decimal(value)),
+    'VALIDATE': _validate,
+}
+
+
+def handle_request(line: str) -> str:
+    """ Processes one request line of the protocol and returns the response line (without the line terminator) """
+    command, *values = line.split()
+    if command.upper() not in COMMANDS:
+        return f'ERR Unknown command {command!r}; expected one of {", ".join(COMMANDS)}'
+
+    convert = COMMANDS[command.upper()]
+    try:
+        return ' '.join(['OK'] + [convert(value) for value in values])
+    except (RomanNumeralTypeError, RomanNumeralValueError, ValueError) as e:
+        return f'ERR {e}'
+
+
+class RomanServer:
+    """ asyncio server exposing the conversions over TCP or a Unix socket, using the line protocol described above """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, path: Optional[str] = None,
+                 max_connections: int = 100):
+        """ The server listens on the Unix socket found at <path> if given, otherwise on <host>:<port> (port 0 lets the
+        operating system pick a free port). Connections exceeding <max_connections> are refused with an error line """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_connections = max_connections
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """ Starts listening for connections """
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path=self.path, limit=LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port, limit=LINE_LIMIT)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """ Stops listening for connections, cancels the handlers of the open connections and waits for the server to
+        shut down """
+        if self._server is not None:
+            self._server.close()
+            for handler in self._handlers:
+                handler.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """ Starts the server, if needed, and serves connections until cancelled """
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()  # type: ignore[union-attr]
+
+    async def __aenter__(self) -> 'RomanServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @staticmethod
+    async def _skip_line(reader: asyncio.StreamReader) -> bool:
+        """ Discards the rest of a line exceeding the line limit; returns False if the connection is closed first """
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                return True
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)
+            except asyncio.IncompleteReadError:
+                return False
+
+    @staticmethod
+    async def _discard(reader: asyncio.StreamReader) -> None:
+        """ Reads and ignores everything sent on a connection, until the client closes it """
+        while await reader.read(65536):
+            pass
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Answers the requests of one connection, one line at a time """
+        handler = asyncio.current_task()
+        if handler is not None:
+            self._handlers.add(handler)
+            handler.add_done_callback(self._handlers.discard)
+
+        if self.connections >= self.max_connections:
+            writer.write(f'BUSY Too many connections (Limit: {self.max_connections})\n'.encode(ENCODING))
+            writer.write_eof()
+            # Requests already sent by the client are discarded before closing, so that the error line is not lost
+            # because of the connection being reset
+            try:
+                await asyncio.wait_for(self._discard(reader), timeout=1)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+            writer.close()
+            return
+
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial
+                except asyncio.LimitOverrunError:
+                    # Overlong lines are answered with an error and skipped, keeping the connection usable
+                    writer.write(f'ERR The request line exceeds the limit of {LINE_LIMIT} bytes\n'.encode(ENCODING))
+                    if not await self._skip_line(reader):
+                        break
+                    continue
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = handle_request(line.decode(ENCODING, errors='replace'))
+                writer.write(response.encode(ENCODING, errors='replace') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+
+class RomanClient:
+    """ asyncio client for RomanServer, keeping a pool of reusable connections """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, path: Optional[str] = None, pool_size: int = 4):
+        """ The client opens at most <pool_size> connections, lazily; requests wait for a free connection slot """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.pool_size = pool_size
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle: Deque[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = collections.deque()
+
+    async def _acquire(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """ Waits for a free connection slot, then takes an idle connection or opens a new one. Slots are released
+        whether the connection is returned to the pool or dropped, so waiting requests always get a chance to open a
+        new connection after a failure """
+        await self._slots.acquire()
+        try:
+            if self._idle:
+                return self._idle.popleft()
+            if self.path is not None:
+                return await asyncio.open_unix_connection(self.path, limit=LINE_LIMIT)
+            return await asyncio.open_connection(self.host, self.port, limit=LINE_LIMIT)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter], reusable: bool) -> None:
+        """ Returns a connection to the pool, or closes it if it cannot be reused, and frees its slot """
+        if reusable:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+        self._slots.release()
+
+    async def execute_many(self, requests: Sequence[Tuple[str, Sequence[Union[str, int, Roman]]]]) -> List[List[str]]:
+        """ Sends several (command, values) requests at once, pipelined on the same connection, and returns the results
+        of each of them. Requests with more than BATCH_LIMIT values are split into several request lines. A
+        RomanNumeralValueError is raised if any of the requests failed """
+        lines: List[int] = []  # Number of request lines sent for each request
+        reader, writer = connection = await self._acquire()
+        try:
+            for command, values in requests:
+                values = [(v.roman if command.upper() == 'DECIMAL' else v.decimal) if isinstance(v, Roman) else v
+                          for v in values]
+                batches = [values[i:i + BATCH_LIMIT] for i in range(0, len(values), BATCH_LIMIT)] or [values]
+                for batch in batches:
+                    writer.write(' '.join([command] + [str(v) for v in batch]).encode(ENCODING) + b'\n')
+                lines.append(len(batches))
+            await writer.drain()
+            responses = [(await reader.readline()).decode(ENCODING) for _ in range(sum(lines))]
+        except BaseException:
+            # The connection may be left in the middle of a pipeline, so it cannot be reused
+            self._release(connection, reusable=False)
+            raise
+
+        # Connections refused or closed by the server are dropped, so that later requests open new ones
+        reusable = all(response and not response.startswith('BUSY ') for response in responses) and not reader.at_eof()
+        self._release(connection, reusable)
+
+        results: List[List[str]] = []
+        for response in responses:
+            if not response:
+                raise ConnectionError('The server closed the connection')
+            status, _, payload = response.rstrip('\n').partition(' ')
+            if status != 'OK':  # ERR or BUSY
+                raise RomanNumeralValueError(payload)
+            results.append(payload.split())
+
+        batches = iter(results)
+        return [list(itertools.chain.from_iterable(itertools.islice(batches, count))) for count in lines]
+
+    async def execute(self, command: str, values: Sequence[Union[str, int, Roman]]) -> List[str]:
+        """ Sends one request and returns its results """
+        return (await self.execute_many([(command, values)]))[0]
+
+    async def to_roman(self, values: Sequence[int]) -> List[str]:
+        """ Converts a batch of decimal numbers to Roman numerals """
+        return await self.execute('ROMAN', values)
+
+    async def to_decimal(self, values: Sequence[str]) -> List[int]:
+        """ Converts a batch of Roman numerals to decimal numbers """
+        return [int(result) for result in await self.execute('DECIMAL', values)]
+
+    async def validate(self, values: Sequence[Union[str, int]]) -> List[bool]:
+        """ Checks which of the given representations are valid """
+        return [result == '1' for result in await self.execute('VALIDATE', values)]
+
+    async def close(self) -> None:
+        """ Closes all the idle connections of the pool """
+        while self._idle:
+            _, writer = self._idle.popleft()
+            writer.close()
+            await writer.wait_closed()
+
+    async def __aenter__(self) -> 'RomanClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serves Roman numeral conversions over a line protocol')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--path', help='Unix socket path; takes precedence over --host and --port')
+    parser.add_argument('--max-connections', type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(RomanServer(args.host, args.port, args.path, args.max_connections).serve_forever())
@@ -0,0 +1,194 @@
+import mmap
+import sys
+import zlib
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+from scripts import snapshot, tables
+from scripts.enums import NumeralProperty
+from scripts.exceptions import RomanNumeralValueError
+from scripts.indexes import property_index
+from scripts.roman import Roman
+from scripts.snapshot import HEADER, LAYOUT_VERSION, MAGIC, SLOTS, STRING_WIDTH, check_header
+
+
+def _slot(roman: bytes) -> int:
+    """ Returns the first hash table slot of a roman representation. zlib.crc32 is used instead of hash(), because
+    the latter is randomized differently in every process """
+    return zlib.crc32(roman) & (SLOTS - 1)
+
+
+def _buffer_of(shm: shared_memory.SharedMemory) -> memoryview:
+    """ Returns a new view over the buffer of a shared memory block """
+    if shm.buf is None:
+        raise ValueError(f'The shared memory block {shm.name} is closed')
+
+    return memoryview(shm.buf)
+
+
+def build_layout() -> bytes:
+    """ Serializes the conversion tables and the property index of the domain into the shared layout """
+    romans = tables.roman_table()
+    index = property_index()
+
+    strings = b''.join(roman.encode('ascii').ljust(STRING_WIDTH, b'\0') for roman in romans)
+    slots = [0] * SLOTS
+    for decimal, roman in enumerate(romans):
+        slot = _slot(roman.encode('ascii'))
+        while slots[slot]:
+            slot = (slot + 1) & (SLOTS - 1)
+        slots[slot] = decimal + 1
+
+    payload = strings + index.lengths.tobytes() + index.properties.tobytes() + array('H', slots).tobytes()
+    header = HEADER.pack(MAGIC, LAYOUT_VERSION, STRING_WIDTH, tables.domain_checksum(), len(romans),
+                         zlib.crc32(payload))
+    return header + payload
+
+
+class SharedTables:
+    """ Read-only view over the conversion tables and property index of the domain, stored in the layout described in
+    scripts.snapshot. The layout lives either in a multiprocessing.shared_memory block or in a memory-mapped file, so
+    that it is built once and then attached by every worker process without copying it """
+    def __init__(self, buffer: memoryview, shm: Optional[shared_memory.SharedMemory] = None,
+                 mapping: Optional[mmap.mmap] = None):
+        """ The constructor checks the header of the layout (see snapshot.check_header) """
+        count = check_header(buffer)
+        width = STRING_WIDTH
+
+        self.buffer = buffer
+        self.count = count
+        self._shm = shm
+        self._mapping = mapping
+
+        offset = HEADER.size
+        self._strings = buffer[offset:offset + count * width]
+        offset += count * width
+        self._lengths = buffer[offset:offset + count]
+        offset += count
+        self._properties = buffer[offset:offset + 2 * count].cast('H')
+        offset += 2 * count
+        self._slots = buffer[offset:offset + 2 * SLOTS].cast('H')
+
+    ### Creation and attachment
+    @classmethod
+    def publish(cls, name: Optional[str] = None) -> 'SharedTables':
+        """ Builds the layout into a new shared memory block; the publishing process owns the block and should unlink
+        it when the workers are done """
+        layout = build_layout()
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(layout))
+        buffer = _buffer_of(shm)
+        buffer[:len(layout)] = layout
+        return cls(buffer.toreadonly(), shm=shm)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedTables':
+        """ Attaches, read-only, to a shared memory block published by another process """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Only the publishing process may unlink the block, so it must not be tracked by attaching processes
+            resource_tracker.unregister(shm._name, 'shared_memory')  # type: ignore[attr-defined]
+        buffer = _buffer_of(shm).toreadonly()
+        try:
+            return cls(buffer, shm=shm)
+        except ValueError:
+            buffer.release()
+            shm.close()
+            raise
+
+    @staticmethod
+    def write_file(path: str) -> None:
+        """ Writes the layout into a file, which can then be memory-mapped by any number of processes. The file is
+        written by snapshot.write, which replaces it atomically, so that processes mapping it meanwhile never see a
+        partially written file """
+        snapshot.write(path)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SharedTables':
+        """ Memory-maps, read-only, a file written by write_file """
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(mapping)
+        try:
+            return cls(buffer, mapping=mapping)
+        except ValueError:
+            buffer.release()
+            mapping.close()
+            raise
+
+    @property
+    def name(self) -> Optional[str]:
+        """ Returns the name of the shared memory block, to be passed to the worker processes """
+        return self._shm.name if self._shm is not None else None
+
+    def close(self) -> None:
+        """ Detaches from the layout; the views over it must not be used afterwards """
+        for view in (self._strings, self._lengths, self._properties, self._slots, self.buffer):
+            view.release()
+        if self._shm is not None:
+            self._shm.close()
+        if self._mapping is not None:
+            self._mapping.close()
+
+    def unlink(self) -> None:
+        """ Destroys the shared memory block; only the publishing process should call this """
+        if self._shm is not None:
+            self._shm.unlink()
+
+    ### Lookups
+    def _check(self, decimal_number: int) -> None:
+        """ Raises the errors of Roman.validate for numbers outside of the tables """
+        if not isinstance(decimal_number, int) or not 0 <= decimal_number < self.count:
+            raise RomanNumeralValueError(Roman.validate(decimal_number))
+
+    def to_roman(self, decimal_number: int) -> str:
+        """ Returns the Roman representation of the given decimal number """
+        self._check(decimal_number)
+        start = decimal_number * STRING_WIDTH
+        return bytes(self._strings[start:start + STRING_WIDTH]).rstrip(b'\0').decode('ascii')
+
+    def to_decimal(self, roman_number: str) -> int:
+        """ Returns the decimal value of the given Roman numeral, probing the shared hash table; numerals missing from
+        it (lowercase, non-canonical or invalid ones) are delegated to tables.to_decimal """
+        if isinstance(roman_number, str) and 0 < len(roman_number) <= STRING_WIDTH and roman_number.isascii():
+            key = roman_number.encode('ascii')
+            slot = _slot(key)
+            while self._slots[slot]:
+                decimal = self._slots[slot] - 1
+                start = decimal * STRING_WIDTH
+                if bytes(self._strings[start:start + len(key)]) == key and \
+                        (len(key) == STRING_WIDTH or self._strings[start + len(key)] == 0):
+                    return decimal
+                slot = (slot + 1) & (SLOTS - 1)
+
+        return tables.to_decimal(roman_number)
+
+    def length(self, decimal_number: int) -> int:
+        """ Returns the length of the Roman representation of the given decimal number """
+        self._check(decimal_number)
+        return self._lengths[decimal_number]
+
+    def properties(self, decimal_number: int) -> NumeralProperty:
+        """ Returns the properties of the given decimal number """
+        self._check(decimal_number)
+        return NumeralProperty(self._properties[decimal_number])
+
+
+### Worker process helpers
+_worker_tables: Optional[SharedTables] = None
+
+
+def worker_initializer(name: str) -> None:
+    """ Initializer for process pools (e.g. ProcessPoolExecutor(initializer=worker_initializer, initargs=(name,))),
+    attaching each worker to the shared memory block published by the parent process """
+    global _worker_tables
+    _worker_tables = SharedTables.attach(name)
+
+
+def worker_tables() -> SharedTables:
+    """ Returns the shared tables attached by worker_initializer in the current worker process """
+    if _worker_tables is None:
+        raise RuntimeError('The shared tables were not attached; use worker_initializer as the pool initializer')
+
+    return _worker_tables
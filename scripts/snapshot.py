@@ -0,0 +1,120 @@
+import argparse
+import mmap
+import os
+import struct
+import warnings
+import zlib
+from typing import Optional, Tuple
+from scripts import tables
+
+
+# Layout of the conversion tables, as stored in snapshot files and in the shared memory blocks of scripts.shared. All
+# the integers are in the native byte order (a layout written on a machine with another byte order is rejected, since
+# its version field does not match):
+#   header:     magic (4 bytes), layout version (uint16), string width (uint16), domain checksum (uint32),
+#               count (uint32), payload checksum (uint32, crc32 of everything following the header)
+#   strings:    <count> roman representations, NUL-padded to <string width> bytes
+#   lengths:    <count> uint8 lengths of the roman representations
+#   properties: <count> uint16 NumeralProperty flags
+#   slots:      <SLOTS> uint16 open-addressing hash table from roman representations to decimal value + 1 (0 = empty)
+MAGIC = b'RNTB'
+LAYOUT_VERSION = 2
+HEADER = struct.Struct('=4sHHIII')
+STRING_WIDTH = 16
+SLOTS = 8192
+
+# Environment variable holding the path of the snapshot loaded when scripts.roman is imported; an empty value disables
+# the loading
+SNAPSHOT_VARIABLE = 'ROMAN_NUMERALS_SNAPSHOT'
+
+
+def default_path() -> str:
+    """ Returns the path of the snapshot: the value of the ROMAN_NUMERALS_SNAPSHOT environment variable, if set, or
+    tables.snapshot, next to this module """
+    return os.environ.get(SNAPSHOT_VARIABLE,
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables.snapshot'))
+
+
+def payload_size(count: int) -> int:
+    """ Returns the size in bytes of the payload (everything following the header) of a layout with <count> entries """
+    return count * (STRING_WIDTH + 3) + 2 * SLOTS
+
+
+def check_header(buffer) -> int:
+    """ Checks the header of a layout and returns its number of entries. Buffers which are truncated, written with
+    another layout version, derived from a different domain (e.g. after changing the RomanNumeral enumeration) or whose
+    payload does not match its checksum (e.g. a corrupted file) are rejected with a ValueError """
+    if len(buffer) < HEADER.size:
+        raise ValueError(f'Unsupported shared tables layout (Truncated to {len(buffer)} bytes)')
+
+    magic, version, width, checksum, count, payload_checksum = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != LAYOUT_VERSION or width != STRING_WIDTH:
+        raise ValueError(f'Unsupported shared tables layout (Magic {magic!r}, version {version})')
+    if checksum != tables.domain_checksum() or count != tables.MAX_VALUE + 1:
+        raise ValueError('The shared tables are stale: they were built for a different Roman numerals domain')
+    if len(buffer) < HEADER.size + payload_size(count):
+        raise ValueError(f'Unsupported shared tables layout (Truncated to {len(buffer)} bytes)')
+    if zlib.crc32(buffer[HEADER.size:HEADER.size + payload_size(count)]) != payload_checksum:
+        raise ValueError('The shared tables are corrupted: their payload does not match its checksum')
+
+    return count
+
+
+def read_romans(buffer) -> Tuple[str, ...]:
+    """ Reads the roman representations out of a layout, indexed by their decimal value """
+    count = check_header(buffer)
+    strings = bytes(buffer[HEADER.size:HEADER.size + count * STRING_WIDTH])
+    return tuple(strings[start:start + STRING_WIDTH].rstrip(b'\0').decode('ascii')
+                 for start in range(0, len(strings), STRING_WIDTH))
+
+
+def write(path: Optional[str] = None) -> str:
+    """ Writes the snapshot of the conversion tables and returns its path. The tables are rebuilt with the reference
+    Roman.convert_to_roman beforehand, so a snapshot loaded by the current process is never copied into the new one.
+    The file is replaced atomically, so that processes starting meanwhile read either the old or the new snapshot """
+    from scripts.shared import build_layout
+
+    tables.preload(None)
+    path = path or default_path()
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(build_layout())
+    os.replace(temporary_path, path)
+
+    return path
+
+
+def load(path: Optional[str] = None) -> bool:
+    """ Memory-maps a snapshot and installs its roman representations as the conversion tables, so that they do not
+    have to be computed. Returns False if there is no snapshot and raises a ValueError if it is stale or corrupted """
+    try:
+        f = open(path or default_path(), 'rb')
+    except FileNotFoundError:
+        return False
+
+    with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        tables.preload(read_romans(mapping))
+
+    return True
+
+
+def autoload() -> bool:
+    """ Loads the snapshot when scripts.roman is imported, if there is one. Stale or corrupted snapshots only issue a
+    warning, since the tables can still be computed; regenerate them with: python -m scripts.snapshot """
+    if not default_path():
+        return False
+
+    try:
+        return load()
+    except (OSError, ValueError) as e:
+        warnings.warn(f'Ignoring the Roman numerals snapshot {default_path()}: {e}', RuntimeWarning)
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Regenerates the snapshot of the Roman numerals conversion tables')
+    parser.add_argument('--output', default=None, help=f'Path of the snapshot; defaults to ${SNAPSHOT_VARIABLE} or '
+                                                       'tables.snapshot, next to the scripts package modules')
+    args = parser.parse_args()
+
+    print(f'Snapshot written to {write(args.output)}')
@@ -0,0 +1,99 @@
+import sqlite3
+from functools import lru_cache, partial
+from typing import Optional, Union
+from scripts import tables
+from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
+from scripts.roman import Roman
+
+
+CONVERSION_ERRORS = (RomanNumeralTypeError, RomanNumeralValueError)
+
+
+@tables.derived
+@lru_cache(maxsize=4096)
+def _to_decimal(representation: Union[str, int]) -> int:
+    """ Cached conversion of a representation to its decimal value; canonical numerals are found in the conversion
+    tables, while the cache spares the validation of the other ones (lowercase, Unicode or non-canonical numerals) """
+    return Roman._decimal_of(representation)
+
+
+@lru_cache(maxsize=4096)
+def _is_valid(representation: Union[str, int]) -> bool:
+    """ Cached check of a representation with Roman.validate """
+    try:
+        return Roman.validate(representation) == 'OK'
+    except RomanNumeralTypeError:
+        return False
+
+
+class _RomanSum:
+    """ SQLite aggregate which sums Roman numerals (or their decimal values), skipping NULLs, and returns the roman
+    representation of the total; like SUM, it returns NULL when there is nothing to sum """
+    def __init__(self, errors: str = 'raise') -> None:
+        self.errors = errors
+        self.total: Optional[int] = None
+
+    def step(self, representation: Union[str, int, None]) -> None:
+        if representation is None:
+            return
+        try:
+            decimal_number = _to_decimal(representation)
+        except CONVERSION_ERRORS:
+            if self.errors == 'raise':
+                raise
+            return
+
+        self.total = (self.total or 0) + decimal_number
+
+    def finalize(self) -> Optional[str]:
+        if self.total is None:
+            return None
+        try:
+            return tables.to_roman(self.total)
+        except RomanNumeralValueError:
+            if self.errors == 'raise':
+                raise
+            return None
+
+
+def register_functions(connection: sqlite3.Connection, errors: str = 'raise') -> None:
+    """ Registers the Roman numerals functions on a SQLite connection, so that conversions run inside the queries:
+        - roman_to_int(r): the decimal value of a Roman numeral
+        - int_to_roman(n): the roman representation of a decimal number
+        - roman_valid(r): 1 if the value is a valid representation (roman or decimal), 0 otherwise
+        - roman_sum(r): aggregate returning the roman representation of the sum of the values
+    NULL arguments give NULL results. The scalar functions are registered as deterministic, so they may be used in
+    indexes on expressions (e.g. CREATE INDEX i ON t(roman_to_int(r))). The <errors> policy decides what happens to
+    invalid values: 'raise' makes the query fail with a sqlite3.OperationalError, 'null' turns them into NULLs """
+    if errors not in ('raise', 'null'):
+        raise ValueError(f"The errors policy must be 'raise' or 'null' (Given: {errors!r})")
+
+    def roman_to_int(representation: Union[str, int, None]) -> Optional[int]:
+        if representation is None:
+            return None
+        try:
+            return _to_decimal(representation)
+        except CONVERSION_ERRORS:
+            if errors == 'raise':
+                raise
+            return None
+
+    def int_to_roman(decimal_number: Optional[int]) -> Optional[str]:
+        if decimal_number is None:
+            return None
+        try:
+            return tables.to_roman(decimal_number)
+        except CONVERSION_ERRORS:
+            if errors == 'raise':
+                raise
+            return None
+
+    def roman_valid(representation: Union[str, int, None]) -> Optional[int]:
+        if representation is None:
+            return None
+        return int(_is_valid(representation))
+
+    connection.create_function('roman_to_int', 1, roman_to_int, deterministic=True)
+    connection.create_function('int_to_roman', 1, int_to_roman, deterministic=True)
+    connection.create_function('roman_valid', 1, roman_valid, deterministic=True)
+    connection.create_aggregate('roman_sum', 1, partial(_RomanSum, errors))  # type: ignore[arg-type]
@@ -0,0 +1,112 @@
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
+from scripts.enums import RomanNumeral
+
+
+MAX_VALUE = 3999
+
+_preloaded_romans: Optional[Tuple[str, ...]] = None
+
+# Caches of other modules holding data computed from the tables, cleared whenever the tables are replaced
+_derived_caches: List[Any] = []
+
+Cached = TypeVar('Cached')
+
+# Translation table from the Unicode Number Forms block (U+2160 - U+2188) to ASCII Roman numerals; code points which are
+# not numerals by themselves (the reversed C) or which are outside of the domain (5000 and above) are not translated
+UNICODE_TO_ASCII = str.maketrans({
+    '\u2160': 'I', '\u2161': 'II', '\u2162': 'III', '\u2163': 'IV', '\u2164': 'V', '\u2165': 'VI', '\u2166': 'VII',
+    '\u2167': 'VIII', '\u2168': 'IX', '\u2169': 'X', '\u216a': 'XI', '\u216b': 'XII', '\u216c': 'L', '\u216d': 'C',
+    '\u216e': 'D', '\u216f': 'M',
+    '\u2170': 'I', '\u2171': 'II', '\u2172': 'III', '\u2173': 'IV', '\u2174': 'V', '\u2175': 'VI', '\u2176': 'VII',
+    '\u2177': 'VIII', '\u2178': 'IX', '\u2179': 'X', '\u217a': 'XI', '\u217b': 'XII', '\u217c': 'L', '\u217d': 'C',
+    '\u217e': 'D', '\u217f': 'M',
+    '\u2180': 'M', '\u2185': 'VI', '\u2186': 'L',
+})
+
+# Translation table from ASCII Roman numerals to the single letter Unicode Roman numerals
+ASCII_TO_UNICODE = str.maketrans({
+    'I': '\u2160', 'V': '\u2164', 'X': '\u2169', 'L': '\u216c', 'C': '\u216d', 'D': '\u216e', 'M': '\u216f',
+})
+
+
+def normalize(roman_number: str) -> str:
+    """ Translates the Unicode Roman numerals found in the given representation to ASCII, in a single pass, and turns
+    the representation to uppercase """
+    return roman_number.translate(UNICODE_TO_ASCII).upper()
+
+
+def domain_checksum() -> int:
+    """ Returns a checksum of everything the tables are derived from (the RomanNumeral enumeration and the maximum
+    value), used for detecting stale copies of the tables persisted outside of the process """
+    description = repr([(r.name, r.value) for r in RomanNumeral] + [MAX_VALUE])
+    return zlib.crc32(description.encode('ascii'))
+
+
+def derived(cache: Cached) -> Cached:
+    """ Decorator registering an lru_cache-wrapped function whose results are computed from the tables (e.g. the
+    property index), so that they are cleared together with the tables by preload """
+    _derived_caches.append(cache)
+    return cache
+
+
+def preload(romans: Optional[Tuple[str, ...]]) -> None:
+    """ Installs prebuilt Roman representations of all the numbers in the domain (e.g. read from a snapshot) as the
+    roman table, so that it does not have to be computed; None drops them, so that the table is computed again. The
+    tables and the registered derived caches are rebuilt on their next use """
+    global _preloaded_romans
+    if romans is not None and len(romans) != MAX_VALUE + 1:
+        raise ValueError(f'The roman table must have {MAX_VALUE + 1} entries (Given: {len(romans)})')
+
+    _preloaded_romans = romans
+    for cache in [roman_table, decimal_table, unicode_table] + _derived_caches:
+        cache.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def roman_table() -> Tuple[str, ...]:
+    """ Returns the Roman representations of all the numbers in the domain (0 to 3999), indexed by their decimal value.
+    The table is either preloaded or computed once, using the reference Roman.convert_to_roman implementation """
+    if _preloaded_romans is not None:
+        return _preloaded_romans
+
+    from scripts.roman import Roman
+
+    return tuple(Roman.convert_to_roman(i) for i in range(MAX_VALUE + 1))
+
+
+@lru_cache(maxsize=None)
+def decimal_table() -> Dict[str, int]:
+    """ Returns a mapping from the canonical Roman representation of every number in the domain to its decimal value.
+    Representations accepted by Roman.validate but which are not canonical (e.g. "IIX") are not part of the table """
+    return {roman: decimal for decimal, roman in enumerate(roman_table())}
+
+
+@lru_cache(maxsize=None)
+def unicode_table() -> Tuple[str, ...]:
+    """ Returns the Roman representations of all the numbers in the domain written with Unicode Roman numerals (one
+    code point per letter; zero stays "N", which has no Unicode form), indexed by their decimal value """
+    return tuple(roman.translate(ASCII_TO_UNICODE) for roman in roman_table())
+
+
+def to_roman(decimal_number: int) -> str:
+    """ Converts the given decimal number to the corresponding Roman numeral using the precomputed table. Values
+    outside of the domain are delegated to Roman.convert_to_roman, which raises the appropriate error """
+    if isinstance(decimal_number, int) and 0 <= decimal_number <= MAX_VALUE:
+        return roman_table()[decimal_number]
+
+    from scripts.roman import Roman
+    return Roman.convert_to_roman(decimal_number)
+
+
+def to_decimal(roman_number: str) -> int:
+    """ Converts the given Roman numeral to the corresponding decimal value using the precomputed table. Numerals
+    missing from the table (lowercase, non-canonical or invalid ones) are delegated to Roman.convert_to_decimal """
+    if isinstance(roman_number, str):
+        decimal_number = decimal_table().get(roman_number)
+        if decimal_number is not None:
+            return decimal_number
+
+    from scripts.roman import Roman
+    return Roman.convert_to_decimal(roman_number)
@@ -0,0 +1,87 @@
+import collections
+import contextlib
+import functools
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class BranchTracer:
+    """ Records how many times each labelled branch of Roman.validate and Roman.convert_to_decimal is taken and how much
+    time is spent in it. The time between two consecutive hits is attributed to the first of them, so every branch is
+    timed until the next branch starts or until the traced function returns """
+    def __init__(self) -> None:
+        self.counts: Dict[str, int] = collections.Counter()
+        self.times: Dict[str, int] = collections.defaultdict(int)
+        self._label: Optional[str] = None
+        self._start = 0
+
+    def hit(self, label: str) -> None:
+        """ Marks the start of a branch, closing the previous one """
+        now = time.perf_counter_ns()
+        if self._label is not None:
+            self.times[self._label] += now - self._start
+        self.counts[label] += 1
+        self._label, self._start = label, time.perf_counter_ns()
+
+    def end(self) -> None:
+        """ Closes the current branch, when the traced function returns """
+        if self._label is not None:
+            self.times[self._label] += time.perf_counter_ns() - self._start
+            self._label = None
+
+    def report(self) -> List[Tuple[str, int, float]]:
+        """ Returns the (label, hits, total time in milliseconds) of every branch, the slowest branches first """
+        rows = [(label, count, self.times[label] / 1e6) for label, count in self.counts.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def format_report(self) -> str:
+        """ Returns the report as a text table """
+        lines = [f'{"branch":<32}{"hits":>12}{"time (ms)":>14}{"per hit (us)":>14}']
+        for label, count, milliseconds in self.report():
+            lines.append(f'{label:<32}{count:>12}{milliseconds:>14.3f}{milliseconds * 1000 / count:>14.3f}')
+
+        return '\n'.join(lines)
+
+
+# The tracer of the current tracing session; the instrumented functions only check it once per call, so tracing costs
+# next to nothing while it is disabled
+active: Optional[BranchTracer] = None
+
+
+def _closing(fn: Callable, tracer: BranchTracer) -> Callable:
+    """ Wraps a traced function so that its last branch is closed when it returns """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            tracer.end()
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def trace() -> Iterator[BranchTracer]:
+    """ Context manager enabling the tracing mode: while it is active, the branches taken inside Roman.validate and
+    Roman.convert_to_decimal are recorded by the tracer it yields. Tracing sessions are process-wide and must not be
+    nested or run concurrently from several threads """
+    from scripts.roman import Roman
+
+    global active
+    if active is not None:
+        raise RuntimeError('A tracing session is already active')
+
+    tracer = BranchTracer()
+    originals = {name: Roman.__dict__[name] for name in ('validate', 'convert_to_decimal')}
+    active = tracer
+    try:
+        for name, original in originals.items():
+            if isinstance(original, staticmethod):
+                setattr(Roman, name, staticmethod(_closing(original.__func__, tracer)))
+            else:
+                setattr(Roman, name, _closing(original, tracer))
+        yield tracer
+    finally:
+        active = None
+        for name, original in originals.items():
+            setattr(Roman, name, original)
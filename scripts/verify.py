@@ -0,0 +1,272 @@
+import argparse
+import functools
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from scripts import codec, dialects, tables
+from scripts.arrays import RomanArray
+from scripts.enums import Dialect, RomanNumeral
+from scripts.parsing import IncrementalParser
+from scripts.roman import Roman
+from scripts.shared import SharedTables, build_layout
+from scripts.sqlite_functions import register_functions
+
+
+# Characters inserted into the near-miss strings: the Roman letters and one character of each invalid class (another
+# letter, a digit, punctuation); delimiters are left out, since they split the input of the streaming parser
+LETTERS = [r.name for r in RomanNumeral]
+NOISE = ['A', '1', '-']
+
+Outcome = Tuple[Any, ...]
+
+
+class Backend:
+    """ Implementation under verification: its conversion functions (either may be None if it only supports one
+    direction), whether it must also match the reference on the near-miss corpus and whether its error messages must
+    be the same as the reference ones (or only the fact that it fails) """
+    def __init__(self, name: str, to_roman: Optional[Callable[[int], str]], to_decimal: Optional[Callable[[str], int]],
+                 corpus: bool = True, messages: bool = True):
+        self.name = name
+        self.to_roman = to_roman
+        self.to_decimal = to_decimal
+        self.corpus = corpus
+        self.messages = messages
+
+
+def _parse(roman_number: str) -> int:
+    """ Parses a single numeral with the streaming parser """
+    parser = IncrementalParser()
+    results = parser.feed(roman_number.encode('ascii')) + parser.finish()
+    if len(results) != 1:
+        raise ValueError(f'Expected one numeral, parsed {len(results)}')
+
+    return results[0][0]
+
+
+def _shared_backend() -> Backend:
+    """ Builds the backend of the shared tables, over a layout built in the memory of the worker """
+    shared = SharedTables(memoryview(build_layout()))
+    return Backend('shared', shared.to_roman, shared.to_decimal)
+
+
+def _sqlite_backend() -> Backend:
+    """ Builds the backend of the SQLite user-defined functions, on an in-memory connection of the worker """
+    connection = sqlite3.connect(':memory:')
+    register_functions(connection)
+    return Backend('sqlite', lambda n: connection.execute('SELECT int_to_roman(?)', (n,)).fetchone()[0],
+                   lambda r: connection.execute('SELECT roman_to_int(?)', (r,)).fetchone()[0], messages=False)
+
+
+def _pandas_backend() -> Backend:
+    """ Builds the backend of the pandas extension array """
+    from scripts.pandas_extension import RomanExtensionArray
+    return Backend('pandas', lambda n: RomanExtensionArray._from_sequence([n]).to_strings()[0],
+                   lambda r: int(RomanExtensionArray._from_sequence([r])._data[0]), corpus=False)
+
+
+def _dialect_backend(dialect: Dialect) -> Backend:
+    """ Builds the backend of a dialect. Only the strict dialect has the reference semantics on the near-miss corpus;
+    every dialect must parse the reference representations and write every number so that, once canonicalized, it is
+    the reference representation """
+    return Backend(f'dialect-{dialect.value}', lambda n: dialects.canonicalize(dialects.to_roman(n, dialect), dialect),
+                   lambda r: dialects.to_decimal(r, dialect), corpus=dialect is Dialect.STRICT)
+
+
+BACKENDS: Dict[str, Callable[[], Backend]] = {
+    'tables': lambda: Backend('tables', tables.to_roman, tables.to_decimal),
+    'shared': _shared_backend,
+    'parser': lambda: Backend('parser', None, _parse),
+    'arrays': lambda: Backend('arrays', lambda n: RomanArray([n]).to_strings()[0],
+                              lambda r: RomanArray([r]).tolist()[0]),
+    # The codec and the pandas extension store values of the domain only, so they are not verified on the corpus: the
+    # reference decodes some non-canonical strings accepted by Roman.validate to values above 3999 (e.g. MMMCMXCMVI),
+    # which they rightly reject
+    'codec': lambda: Backend('codec', lambda n: codec.decode(codec.encode([n])).to_strings()[0],
+                             lambda r: codec.decode(codec.encode([r], width=16)).tolist()[0], corpus=False),
+    'sqlite': _sqlite_backend,
+    'pandas': _pandas_backend,
+    **{f'dialect-{d.value}': functools.partial(_dialect_backend, d) for d in Dialect},
+}
+
+
+def available_backends() -> List[str]:
+    """ Returns the names of the backends whose dependencies are installed """
+    names = list(BACKENDS)
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        names.remove('pandas')
+
+    return names
+
+
+def near_misses(max_strings: Optional[int] = None, seed: int = 0) -> List[str]:
+    """ Generates the near-miss corpus: every string one edit away from a canonical numeral (a deleted, inserted,
+    substituted, duplicated or swapped character, with a Roman letter or an invalid character), plus its lowercase form.
+    Most of them are rejected by Roman.validate, for every reason it detects, while the others are non-canonical
+    numerals it accepts (e.g. IIX). With <max_strings>, a reproducible random sample is returned """
+    corpus = set()
+    for roman in tables.roman_table():
+        for i in range(len(roman) + 1):
+            corpus.add(roman[:i] + roman[i + 1:])
+            corpus.update(roman[:i] + c + roman[i:] for c in LETTERS + NOISE)
+            if i < len(roman):
+                corpus.update(roman[:i] + c + roman[i + 1:] for c in LETTERS + NOISE)
+            if i < len(roman) - 1:
+                corpus.add(roman[:i] + roman[i + 1] + roman[i] + roman[i + 2:])
+
+    corpus.discard('')
+    corpus.difference_update(tables.roman_table())
+    corpus.update([r.lower() for r in corpus])
+
+    strings = sorted(corpus)
+    if max_strings is not None and max_strings < len(strings):
+        strings = sorted(random.Random(seed).sample(strings, max_strings))
+
+    return strings
+
+
+def _outcome(function: Callable, argument: Any) -> Outcome:
+    """ Calls a conversion function and returns its result or, if it raised, the error and its message, as a comparable
+    tuple """
+    try:
+        return 'OK', function(argument)
+    except Exception as e:
+        return 'ERROR', type(e).__name__, str(e)
+
+
+def _without_message(outcome: Outcome) -> Outcome:
+    """ Strips the error type and message of an outcome, for backends which only have to fail like the reference """
+    return outcome[:1] if outcome[0] == 'ERROR' else outcome
+
+
+def _checks(cases: Sequence[Tuple[str, Any]]) -> List[Tuple[str, Any, Outcome, bool]]:
+    """ Turns cases into checks, (direction, argument, reference outcome, whether it comes from the corpus): a domain
+    case, ('domain', n), checks the conversion of n and the parsing of its representation; a corpus case,
+    ('corpus', s), checks the parsing of a near-miss string """
+    checks = []
+    for kind, value in cases:
+        if kind == 'domain':
+            roman = tables.roman_table()[value]
+            checks.append(('to_roman', value, _outcome(Roman.convert_to_roman, value), False))
+            checks.append(('to_decimal', roman, _outcome(Roman.convert_to_decimal, roman), False))
+        else:
+            checks.append(('to_decimal', value, _outcome(Roman.convert_to_decimal, value), True))
+
+    return checks
+
+
+_worker_backends: Dict[str, Backend] = {}
+
+
+def _verify_chunk(names: Sequence[str], cases: Sequence[Tuple[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """ Verifies a chunk of cases against the reference implementation, for every backend, in a worker process (the
+    backends are built once per process). Returns, for each backend, the number of checks, the time spent in the
+    backend and the mismatches """
+    checks = _checks(cases)
+    results = {}
+    for name in names:
+        if name not in _worker_backends:
+            _worker_backends[name] = BACKENDS[name]()
+        backend = _worker_backends[name]
+
+        count, elapsed, mismatches = 0, 0.0, []
+        for direction, argument, expected, from_corpus in checks:
+            function = getattr(backend, direction)
+            if function is None or from_corpus and not backend.corpus:
+                continue
+
+            start = time.perf_counter()
+            actual = _outcome(function, argument)
+            elapsed += time.perf_counter() - start
+            count += 1
+            if not backend.messages:
+                expected, actual = _without_message(expected), _without_message(actual)
+            if actual != expected:
+                mismatches.append({'direction': direction, 'input': argument, 'expected': list(expected),
+                                   'actual': list(actual)})
+
+        results[name] = {'checks': count, 'seconds': elapsed, 'mismatches': mismatches}
+
+    return results
+
+
+def run_verification(backends: Optional[Iterable[str]] = None, workers: Optional[int] = None,
+                     max_strings: Optional[int] = None, chunk_size: int = 2000, seed: int = 0,
+                     max_reported: int = 20) -> Dict[str, Any]:
+    """ Verifies the backends (all the available ones by default) against the reference Roman.convert_to_roman and
+    Roman.convert_to_decimal, over the whole domain and the near-miss corpus (sampled to <max_strings>, if given). The
+    cases are split into chunks verified by a pool of <workers> processes (one per core by default; 0 verifies them
+    in the current process). Returns a report with, for each backend, the number of checks and mismatches and its
+    throughput, and the first <max_reported> mismatches of each backend """
+    names = list(backends or available_backends())
+    unknown = set(names).difference(BACKENDS)
+    if unknown:
+        raise ValueError(f'Unknown backends: {sorted(unknown)} (Available: {list(BACKENDS)})')
+
+    corpus = near_misses(max_strings, seed)
+    cases: List[Tuple[str, Any]] = [('domain', n) for n in range(tables.MAX_VALUE + 1)]
+    cases += [('corpus', string) for string in corpus]
+    chunks = [cases[i:i + chunk_size] for i in range(0, len(cases), chunk_size)]
+
+    totals: Dict[str, Dict[str, Any]] = {name: {'checks': 0, 'seconds': 0.0, 'mismatches': []} for name in names}
+    start = time.perf_counter()
+    if workers == 0:
+        chunk_results: Iterable[Dict[str, Dict[str, Any]]] = (_verify_chunk(names, chunk) for chunk in chunks)
+        for result in chunk_results:
+            _merge(totals, result)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            for result in pool.map(functools.partial(_verify_chunk, names), chunks):
+                _merge(totals, result)
+    duration = time.perf_counter() - start
+
+    return {
+        'duration_s': duration,
+        'workers': workers if workers is not None else os.cpu_count(),
+        'cases': {'domain': tables.MAX_VALUE + 1, 'corpus': len(corpus)},
+        'ok': not any(total['mismatches'] for total in totals.values()),
+        'backends': {name: {
+            'checks': total['checks'],
+            'mismatches': len(total['mismatches']),
+            'seconds': total['seconds'],
+            'checks_per_s': total['checks'] / total['seconds'] if total['seconds'] else 0.0,
+        } for name, total in totals.items()},
+        'mismatches': {name: total['mismatches'][:max_reported] for name, total in totals.items()
+                       if total['mismatches']},
+    }
+
+
+def _merge(totals: Dict[str, Dict[str, Any]], result: Dict[str, Dict[str, Any]]) -> None:
+    """ Adds the results of a chunk to the totals of the backends """
+    for name, chunk_total in result.items():
+        totals[name]['checks'] += chunk_total['checks']
+        totals[name]['seconds'] += chunk_total['seconds']
+        totals[name]['mismatches'] += chunk_total['mismatches']
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Differential verification of the Roman numerals backends against the '
+                                                 'reference implementation, over the whole domain and a corpus of '
+                                                 'near-miss strings')
+    parser.add_argument('--backends', default=None, help='Comma-separated backends; all the available ones if unset')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes; one per core if unset, 0 for none')
+    parser.add_argument('--max-strings', type=int, default=None, help='Sample size of the near-miss corpus')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='Cases verified by a worker at once')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the corpus sampling')
+    parser.add_argument('--output', default=None, help='Path of the JSON report; printed to stdout if unset')
+    args = parser.parse_args()
+
+    report = run_verification(args.backends.split(',') if args.backends else None, args.workers, args.max_strings,
+                              args.chunk_size, args.seed)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    sys.exit(0 if report['ok'] else 1)
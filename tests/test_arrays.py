@@ -0,0 +1,120 @@
+from scripts.arrays import RomanArray
+from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
+from scripts.roman import Roman
+import copy
+import pickle
+import pytest
+
+
+class TestRomanArray:
+    """ Tests for the RomanArray class """
+    ### Tests for the creation of Roman arrays
+    def test_creation(self):
+        """ Tests that arrays can be created out of Roman numerals and their representations """
+        a = RomanArray([Roman(5), 'x', 'MMXXI', 3999, 0])
+
+        assert a.tolist() == [5, 10, 2021, 3999, 0]
+        assert len(a) == 5
+        assert a.nbytes == 10
+
+    def test_invalid_creation(self):
+        """ Tests that invalid representations are rejected with the same errors as the Roman class """
+        with pytest.raises(RomanNumeralValueError) as e:
+            RomanArray([1, 4000])
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Provided 4000)'
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            RomanArray(['IIIII'])
+        err_msg = 'Characters cannot be repeated more than 3 times in one succession (Repeated "I" too many times)'
+        assert str(e.value) == err_msg
+
+        with pytest.raises(RomanNumeralTypeError):
+            RomanArray([8.5])
+
+    ### Tests for the conversion methods
+    def test_to_strings(self):
+        """ Tests that the Roman representations of all elements are returned """
+        a = RomanArray(range(4000))
+
+        assert a.to_strings() == [Roman.convert_to_roman(i) for i in range(4000)]
+
+    def test_iteration(self):
+        """ Tests that iterating over the array produces Roman numerals """
+        a = RomanArray([1, 2, 3])
+
+        assert list(a) == [Roman(1), Roman(2), Roman(3)]
+        assert a[1] == Roman(2)
+        assert a[-1] == Roman(3)
+
+    ### Tests for the slicing and buffer protocol
+    def test_slices_are_views(self):
+        """ Tests that slices share the buffer of the original array """
+        a = RomanArray(range(10))
+        view = a[2:8:2]
+        assert view.tolist() == [2, 4, 6]
+
+        view[0] = 'C'
+        assert a[2] == Roman(100)
+        assert view.data.obj is a.data.obj
+
+    def test_buffer(self):
+        """ Tests that the underlying buffer can be consumed as unsigned 16-bit integers """
+        a = RomanArray(['I', 'V', 'X'])
+
+        assert a.data.format == 'H'
+        assert bytes(a.data) == bytes(memoryview(a.data))
+        assert a.data.tolist() == [1, 5, 10]
+
+        assert a.data.readonly
+        with pytest.raises(TypeError):
+            a.data[0] = 5000
+        assert a.to_strings() == ['I', 'V', 'X']
+
+    def test_pickle_and_copy(self):
+        """ Tests that arrays (and views) are pickled as their decimal values and unpickled to independent arrays """
+        a = RomanArray(range(4000))
+        data = pickle.dumps(a)
+
+        assert len(data) < a.nbytes + 100
+        assert pickle.loads(data).tolist() == list(range(4000))
+        assert pickle.loads(pickle.dumps(a[10:20:3])).tolist() == [10, 13, 16, 19]
+
+        b = copy.deepcopy(a)
+        b[0] = 'MMXXI'
+        assert (a[0], b[0]) == (Roman(0), Roman(2021))
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            pickle.loads(data.replace((3999).to_bytes(2, 'little'), (4000).to_bytes(2, 'little')))
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Provided 4000)'
+
+    ### Tests for the arithmetic operators
+    def test_arithmetic(self):
+        """ Tests the element-wise operations with arrays and scalars """
+        a = RomanArray([10, 20, 30])
+        b = RomanArray([1, 2, 3])
+
+        assert (a + b).tolist() == [11, 22, 33]
+        assert (a - b).tolist() == [9, 18, 27]
+        assert (a * 2).tolist() == [20, 40, 60]
+        assert (2 * a).tolist() == [20, 40, 60]
+        assert (a // 'III').tolist() == [3, 6, 10]
+        assert (a % Roman(7)).tolist() == [3, 6, 2]
+        assert (1 + a).tolist() == [11, 21, 31]
+
+    def test_arithmetic_out_of_domain(self):
+        """ Tests that the results are checked against the Roman numerals domain """
+        a = RomanArray([1000, 2000])
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            a * 2
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Provided 4000)'
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            a - 1001
+        assert str(e.value) == 'Negative Roman numerals do not exist; conversion is impossible (Provided -1)'
+
+        with pytest.raises(ValueError):
+            a + RomanArray([1])
+
+        with pytest.raises(TypeError):
+            a + [1, 2]
@@ -0,0 +1,72 @@
+from scripts import codec
+from scripts.arrays import RomanArray
+from scripts.exceptions import RomanNumeralValueError
+from scripts.roman import Roman
+import io
+import pytest
+
+
+class TestCodec:
+    """ Tests for the compact binary format of Roman numerals """
+    ### Tests for the bulk functions
+    @pytest.mark.parametrize('width', [12, 16])
+    def test_round_trip(self, width):
+        """ Tests that decoding the encoded numerals yields the original values, for the whole domain """
+        encoded = codec.encode(range(4000), width)
+
+        assert codec.decode(encoded) == RomanArray(range(4000))
+        assert len(encoded) == codec.HEADER_SIZE + 4000 * width // 8
+
+    def test_odd_number_of_values(self):
+        """ Tests that the padding word used for 12-bit packing is not decoded as a value, and is only accepted at the
+        end of the stream """
+        encoded = codec.encode([Roman('MMXXI'), 'iv', 7])
+
+        assert len(encoded) == codec.HEADER_SIZE + 6
+        assert codec.decode(encoded).tolist() == [2021, 4, 7]
+        assert list(codec.iter_decode([encoded[:6], encoded[6:]])) == [2021, 4, 7]
+
+        for data in [b'RN\x0c\xff\xf0\x01\x00\x10\x02', b'RN\x0c\xff\xff\xff', b'RN\x0c\xff\xf0\x01']:
+            with pytest.raises(RomanNumeralValueError) as e:
+                codec.decode(data)
+            assert str(e.value) == 'The padding word can only appear at the end of the stream'
+
+        with pytest.raises(RomanNumeralValueError):
+            list(codec.iter_decode([b'RN\x0c\x00\x1f\xff', b'\x00\x10\x02']))
+
+    def test_invalid_data(self):
+        """ Tests that corrupted streams are rejected """
+        with pytest.raises(ValueError):
+            codec.encode([1, 2], width=8)
+
+        with pytest.raises(ValueError):
+            codec.decode(b'XY\x0c')
+
+        with pytest.raises(ValueError):
+            codec.decode(codec.encode([1, 2])[:-1])
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            codec.decode(codec.MAGIC + bytes([16]) + (4000).to_bytes(2, 'little'))
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Decoded 4000)'
+
+    ### Tests for the streaming functions
+    def test_streaming(self):
+        """ Tests that streams split in arbitrary chunks are decoded incrementally """
+        values = list(range(0, 4000, 7))
+        encoded = b''.join(codec.iter_encode(values, chunk_size=11))
+        chunks = [encoded[i:i + 5] for i in range(0, len(encoded), 5)]
+
+        assert list(codec.iter_decode(chunks)) == values
+
+        with pytest.raises(ValueError):
+            list(codec.iter_encode(values, chunk_size=0))
+
+    def test_files(self):
+        """ Tests that numerals can be written to and read from binary files """
+        fp = io.BytesIO()
+        codec.dump(['I', 'II', 'III'], fp, width=16)
+        fp.seek(0)
+
+        assert list(codec.load(fp, chunk_size=3)) == [1, 2, 3]
+        with pytest.raises(ValueError):
+            list(codec.load(fp, chunk_size=0))
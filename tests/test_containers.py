@@ -0,0 +1,56 @@
+from scripts.containers import RomanKeyedDict, RomanSet
+from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
+from scripts.roman import Roman
+import pytest
+
+
+class TestRomanKeyedDict:
+    """ Tests for the dictionary keyed by Roman numerals """
+    def test_representations_are_one_key(self):
+        """ Tests that a Roman numeral and all its representations address the same value """
+        d = RomanKeyedDict({'X': 'ten', 14: 'fourteen'}, MMXXI='year')
+        d[Roman(10)] = 'TEN'
+
+        assert len(d) == 3
+        assert d[10] == d['x'] == d['Ⅹ'] == 'TEN'
+        assert d.get('XIV') == 'fourteen'
+        assert list(d) == [Roman(10), Roman(14), Roman(2021)]
+        assert dict(d.decimal_items()) == {10: 'TEN', 14: 'fourteen', 2021: 'year'}
+        assert repr(d) == "RomanKeyedDict({X: 'TEN', XIV: 'fourteen', MMXXI: 'year'})"
+
+        del d['mmxxi']
+        assert 2021 not in d
+
+    def test_invalid_keys(self):
+        """ Tests that invalid keys are missing on lookup and rejected on insertion """
+        d = RomanKeyedDict()
+        assert 'XXXX' not in d and 4000 not in d and 1.5 not in d
+        with pytest.raises(KeyError):
+            d['XXXX']
+        with pytest.raises(KeyError):
+            del d[-1]
+
+        with pytest.raises(RomanNumeralValueError):
+            d['XXXX'] = 40
+        with pytest.raises(RomanNumeralTypeError):
+            d[1.5] = 1.5
+
+
+class TestRomanSet:
+    """ Tests for the set of Roman numerals """
+    def test_set_operations(self):
+        """ Tests membership and the set operations across representations """
+        s = RomanSet(['X', 'iv', 4, Roman(10)])
+
+        assert len(s) == 2
+        assert 'IV' in s and 10 in s and 'XXXX' not in s
+        assert s | {'V'} == RomanSet([4, 5, 10])
+        assert s & RomanSet(['IV']) == RomanSet([4])
+        assert s.decimals() == {4, 10}
+        assert repr(s) == 'RomanSet({IV, X})'
+
+        s.discard('x')
+        s.discard('XXXX')
+        assert s.decimals() == {4}
+        with pytest.raises(RomanNumeralValueError):
+            s.add(4000)
@@ -0,0 +1,55 @@
+from scripts import dialects, tables
+from scripts.enums import Dialect
+from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
+import pytest
+
+
+class TestDialects:
+    """ Tests for the alternative notations of Roman numerals """
+    ### Tests for formatting
+    def test_to_roman(self):
+        """ Tests the representations written by each dialect """
+        assert [dialects.to_roman(n, Dialect.ADDITIVE) for n in (4, 9, 49, 1994)] == \
+            ['IIII', 'VIIII', 'XXXXVIIII', 'MDCCCCLXXXXIIII']
+        assert [dialects.to_roman(n, Dialect.CLOCK) for n in (4, 9, 14, 1994)] == ['IIII', 'IX', 'XIIII', 'MCMXCIIII']
+        assert dialects.to_roman(1994) == dialects.to_roman(1994, Dialect.LENIENT) == 'MCMXCIV'
+        assert dialects.to_roman(0, Dialect.ADDITIVE) == 'N'
+
+        with pytest.raises(RomanNumeralValueError):
+            dialects.to_roman(4000, Dialect.ADDITIVE)
+
+    ### Tests for parsing
+    def test_round_trip(self):
+        """ Tests that every dialect parses back the representations it writes, over the whole domain """
+        for dialect in Dialect:
+            table = dialects.compiled(dialect).format_table
+            assert all(dialects.to_decimal(table[n], dialect) == n for n in range(tables.MAX_VALUE + 1))
+
+    def test_to_decimal(self):
+        """ Tests which representations are accepted by each dialect """
+        assert dialects.to_decimal('mdccccLXXXXiiii', Dialect.ADDITIVE) == 1994
+        assert dialects.to_decimal('MCMXCIV', Dialect.ADDITIVE) == 1994
+        assert dialects.to_decimal('Ⅻ', Dialect.CLOCK) == 12
+        assert [dialects.to_decimal(r, Dialect.LENIENT) for r in ('IIX', 'XIIX', 'IIII', 'MCMXCIIII')] == \
+            [8, 18, 4, 1994]
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            dialects.to_decimal('IIII')
+        assert str(e.value) == 'Characters cannot be repeated more than 3 times in one succession (Repeated "I" too ' \
+                               'many times)'
+        with pytest.raises(RomanNumeralValueError) as e:
+            dialects.to_decimal('IIX', Dialect.ADDITIVE)
+        assert str(e.value) == "'IIX' is not a valid Roman numeral in the additive dialect"
+        with pytest.raises(RomanNumeralValueError):
+            dialects.to_decimal('MMMM', Dialect.LENIENT)
+        with pytest.raises(RomanNumeralValueError):
+            dialects.to_decimal('XIIA', Dialect.LENIENT)
+        with pytest.raises(RomanNumeralTypeError):
+            dialects.to_decimal(12, Dialect.LENIENT)
+
+    def test_canonicalize(self):
+        """ Tests the rewriting of representations in the strict notation """
+        assert dialects.canonicalize('XIIX') == 'XVIII'
+        assert dialects.canonicalize('MDCCCCLXXXXIIII') == 'MCMXCIV'
+        assert dialects.canonicalize('IIII', Dialect.CLOCK) == 'IV'
+        assert dialects.canonicalize('mcmxciv', Dialect.STRICT) == 'MCMXCIV'
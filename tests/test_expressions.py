@@ -0,0 +1,71 @@
+from scripts.exceptions import RomanNumeralValueError
+from scripts import expressions
+from scripts.expressions import RomanExpression
+from scripts.roman import Roman
+import pytest
+
+
+class TestRomanExpression:
+    """ Tests for the lazy arithmetic expressions """
+    def test_evaluation(self):
+        """ Tests that expressions mixing Roman numerals and representations evaluate like the eager operators """
+        a, b, c, d = Roman('X'), 'V', 3, Roman(7)
+        expression = (Roman.expr(a) + b) * c - d
+
+        assert repr(expression) == '(((X + V) * III) - VII)'
+        assert expression.evaluate() == (a + b) * c - d
+        assert (100 - Roman.expr('X') // 3 % 2).evaluate() == Roman(99)
+
+    def test_intermediate_results(self):
+        """ Tests that only the final result must be a valid Roman numeral """
+        expression = Roman.expr(3999) * 3 // 'X'
+        assert expression.evaluate() == Roman(1199)
+
+        expression = Roman.expr('I') - 'V' + 'X'
+        assert expression.evaluate() == Roman(6)
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            (Roman.expr(2000) * 2).evaluate()
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Provided 4000)'
+
+        with pytest.raises(RomanNumeralValueError):
+            Roman.expr(4000)
+
+    def test_common_subexpressions(self, monkeypatch):
+        """ Tests that identical sub-expressions are only evaluated once when caching, with the same results """
+        additions = []
+        monkeypatch.setitem(expressions.OPERATORS, '+', lambda a, b: additions.append((a, b)) or a + b)
+        shared = Roman.expr('X') + 'V'
+        expression = shared * (Roman.expr(10) + 5) - shared
+
+        assert expression.value(cache=True) == 210
+        assert len(additions) == 1
+
+        assert expression.value(cache=False) == 210
+        assert len(additions) == 4
+
+    def test_long_chain(self):
+        """ Tests that long chains of operations are evaluated without recursion """
+        expression = RomanExpression.of(0)
+        for _ in range(10000):
+            expression = expression + 1 - 1
+        expression = expression + 'MMXXI'
+
+        assert expression.evaluate() == Roman(2021)
+
+    def test_roman_left_operand(self):
+        """ Tests that Roman numerals on the left of an expression defer to its reflected operators """
+        d, x = Roman('C'), Roman.expr('X')
+
+        assert repr(d - x) == '(C - X)'
+        assert [(d + x).evaluate(), (d * x).evaluate(), (d // x).evaluate(), (d % Roman.expr(7)).evaluate()] == \
+            [Roman(110), Roman(1000), Roman(10), Roman(2)]
+
+        with pytest.raises(TypeError) as e:
+            d + [1]
+        assert str(e.value) == "Roman numeral addition requires str, int or Roman as right operand, not <class 'list'>"
+
+    def test_invalid_operand(self):
+        """ Tests that unsupported operands raise a TypeError """
+        with pytest.raises(TypeError):
+            Roman.expr(1) + [1]
@@ -0,0 +1,76 @@
+from scripts.enums import NumeralProperty
+from scripts.indexes import SubstringIndex, as_romans, property_index, substring_index
+from scripts.roman import Roman
+import pytest
+
+
+class TestPropertyIndex:
+    """ Tests for the property index of the Roman numerals domain """
+    def test_with_length(self):
+        """ Tests the lookup of numerals by the length of their roman representation """
+        expected = [i for i in range(4000) if len(Roman(i)) == 7]
+
+        assert property_index().with_length(7).tolist() == expected
+        assert property_index().with_length(7, 'C', 'D').tolist() == [i for i in expected if 100 <= i <= 500]
+        assert property_index().with_length(20).tolist() == []
+
+    def test_with_symbol_count(self):
+        """ Tests the lookup of numerals by the number of occurrences of a letter """
+        index = property_index()
+
+        assert index.with_symbol_count('m', 3).tolist() == [i for i in range(4000) if Roman(i).roman.count('M') == 3]
+        assert index.with_symbol_count('X', 0, 0, 20).tolist() == list(range(9))
+
+    def test_with_properties(self):
+        """ Tests the lookup of numerals by their properties """
+        index = property_index()
+        primes = [r.decimal for r in Roman.prime_generator()]
+
+        assert index.with_properties(NumeralProperty.PRIME, 'C', 'D').tolist() == [p for p in primes if 100 <= p <= 500]
+        assert index.with_properties(NumeralProperty.FIBONACCI).tolist() == \
+            sorted({r.decimal for r in Roman.fibonacci_generator()})
+        assert index.with_properties(NumeralProperty.XC).tolist() == [i for i in range(4000) if 'XC' in Roman(i)]
+        assert index.with_properties(NumeralProperty.PRIME | NumeralProperty.FIBONACCI).tolist() == \
+            [2, 3, 5, 13, 89, 233, 1597]
+
+    def test_query(self):
+        """ Tests the lookup of numerals matching several criteria """
+        result = property_index().query(length=7, properties=NumeralProperty.PRIME, symbol_counts={'C': 1})
+        expected = [p.decimal for p in Roman.prime_generator() if len(p) == 7 and p.roman.count('C') == 1]
+
+        assert result.tolist() == expected
+        assert property_index().query().tolist() == list(range(4000))
+
+    def test_as_romans(self):
+        """ Tests that query results can be turned lazily into Roman numerals """
+        romans = as_romans(property_index().with_length(1))
+
+        assert next(romans) == Roman('N')
+        assert list(romans) == [Roman('I'), Roman('V'), Roman('X'), Roman('L'), Roman('C'), Roman('D'), Roman('M')]
+
+
+class TestSubstringIndex:
+    """ Tests for the substring index of roman representations """
+    def test_domain(self):
+        """ Tests that the domain index agrees with the *in* operator of the Roman class """
+        romans = list(Roman.roman_generator())
+
+        for item in ['C', 'cm', 'XC', 'MCM', 'CMXC', 'MMMCMXCIX', 'IIII', 'VX', '', '\u2169', '\u216f\u216d\u2179']:
+            expected = [r.decimal for r in romans if item in r]
+            assert substring_index().containing(item).tolist() == expected
+        assert len(substring_index().containing('\u2169')) > 0
+
+    def test_collection(self):
+        """ Tests that collections of numerals are indexed by position """
+        index = SubstringIndex([Roman(1994), '\u2169\u2163', Roman(4)], gram_size=2)
+        assert index.add('MCMXC') == 3
+        assert len(index) == 4
+
+        assert index.containing('IV').tolist() == [0, 1, 2]
+        assert index.containing('CMX').tolist() == [0, 3]
+        assert index.containing('MCMXCIV').tolist() == [0]
+        assert index.containing('L').tolist() == []
+        assert index.containing('\u2179\u2173').tolist() == [1]
+
+        with pytest.raises(TypeError):
+            index.containing(2)
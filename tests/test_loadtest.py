@@ -0,0 +1,30 @@
+from scripts.loadtest import percentile, run_load_test
+import json
+import pytest
+
+
+class TestLoadTest:
+    """ Tests for the load test harness of the producer / consumer pipeline """
+    def test_percentile(self):
+        """ Tests the nearest-rank percentiles """
+        values = list(range(1, 101))
+
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile(values, 1) == 100
+        assert percentile([3.0], 0.95) == 3.0
+        assert percentile([], 0.5) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_report(self):
+        """ Tests that every produced item is consumed and accounted for in the report """
+        report = await run_load_test(producers=3, consumers=2, queue_size=5, items=40, rate=None)
+
+        assert report['items'] == 120
+        # The Fibonacci numbers found at indexes 2, 3, 4, 6, 10, 12 and 16 of the sequence are prime
+        assert report['primes_consumed'] == 3 * sum(1 for i in range(40) if i % 18 in (2, 3, 4, 6, 10, 12, 16))
+        assert report['latency_ms']['p50'] <= report['latency_ms']['p95'] <= report['latency_ms']['p99'] \
+            <= report['latency_ms']['max']
+        assert report['queue_depth']['max'] <= 5
+        assert report['throughput_items_per_s'] > 0
+        json.dumps(report)
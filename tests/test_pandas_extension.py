@@ -0,0 +1,90 @@
+from scripts.exceptions import RomanNumeralValueError
+from scripts.roman import Roman
+import pytest
+
+pd = pytest.importorskip('pandas')
+pandas_extension = pytest.importorskip('scripts.pandas_extension')
+
+
+class TestRomanDtype:
+    """ Tests for the Roman pandas extension type """
+    ### Tests for the creation and conversion of Roman columns
+    def test_creation(self):
+        """ Tests that columns can be created out of Roman numerals, their representations and missing values """
+        s = pd.Series(['XIV', 3, Roman(5), None, 'mmxxi'], dtype='roman')
+
+        assert isinstance(s.dtype, pandas_extension.RomanDtype)
+        assert s[0] == Roman(14)
+        assert s[3] is pd.NA
+        assert s.isna().tolist() == [False, False, False, True, False]
+        assert s.array._data.dtype.itemsize == 2
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            pd.Series([1, 4000], dtype='roman')
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Provided 4000)'
+
+    def test_astype(self):
+        """ Tests the conversions from and to string and integer columns """
+        s = pd.Series(['X', 'v', 'MCM'], dtype='str').astype('roman')
+
+        assert s.astype(str).tolist() == ['X', 'V', 'MCM']
+        assert s.astype(int).tolist() == [10, 5, 1900]
+        assert pd.Series([1, None], dtype='roman').astype('string').tolist() == ['I', pd.NA]
+
+    ### Tests for the operators
+    def test_arithmetic(self):
+        """ Tests that arithmetic operations respect the Roman numerals domain and propagate missing values """
+        s = pd.Series([10, None, 1000], dtype='roman')
+
+        assert (s + 1).tolist() == [Roman(11), pd.NA, Roman(1001)]
+        assert (s * pd.Series([2, 2, 3], dtype='roman')).tolist() == [Roman(20), pd.NA, Roman(3000)]
+        assert (s // 'III').tolist() == [Roman(3), pd.NA, Roman(333)]
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            s * 4
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Provided 4000)'
+
+        with pytest.raises(RomanNumeralValueError):
+            s - 11
+
+        with pytest.raises(ZeroDivisionError):
+            s % 0
+
+    def test_comparison(self):
+        """ Tests that comparisons return nullable boolean columns """
+        s = pd.Series([10, None, 1000], dtype='roman')
+
+        assert (s > 'L').tolist() == [False, pd.NA, True]
+        assert (s == Roman(10)).tolist() == [True, pd.NA, False]
+
+    def test_reductions(self):
+        """ Tests the min, max and sum reductions, with missing values and the Roman numerals domain """
+        s = pd.Series([10, None, 1000, 'IV'], dtype='roman')
+
+        assert [s.min(), s.max(), s.sum()] == [Roman(4), Roman(1000), Roman(1014)]
+        assert s.min(skipna=False) is pd.NA
+        assert s.sum(skipna=False) is pd.NA
+        assert pd.Series([None], dtype='roman').max() is pd.NA
+        assert pd.Series([None], dtype='roman').sum() == Roman(0)
+        assert pd.Series([None], dtype='roman').sum(min_count=1) is pd.NA
+        assert pd.DataFrame({'numeral': s}).min().tolist() == [Roman(4)]
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            pd.Series([2000, 2000], dtype='roman').sum()
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Provided 4000)'
+
+        with pytest.raises(TypeError):
+            s.mean()
+
+    ### Tests for the table operations
+    def test_sort_groupby_merge(self):
+        """ Tests sorting, grouping and merging on Roman columns """
+        df = pd.DataFrame({'numeral': pd.Series(['X', 'I', None, 'X'], dtype='roman'), 'value': [1, 2, 3, 4]})
+
+        assert df['numeral'].sort_values().tolist() == [Roman(1), Roman(10), Roman(10), pd.NA]
+        assert df.groupby('numeral')['value'].sum().to_dict() == {Roman(1): 2, Roman(10): 5}
+
+        other = pd.DataFrame({'numeral': pd.Series(['I', 'X'], dtype='roman'), 'name': ['one', 'ten']})
+        merged = df.merge(other, on='numeral')
+        assert sorted(zip(merged['value'], merged['name'])) == [(1, 'ten'), (2, 'one'), (4, 'ten')]
+        assert merged['numeral'].dtype == df['numeral'].dtype
@@ -0,0 +1,61 @@
+from scripts.exceptions import RomanNumeralValueError
+from scripts.parsing import IncrementalParser
+from scripts.roman import Roman
+import pytest
+
+
+class TestIncrementalParser:
+    """ Tests for the IncrementalParser class """
+    def test_single_chunk(self):
+        """ Tests that the numerals of a stream delivered at once are parsed, with their spans """
+        parser = IncrementalParser()
+
+        assert parser.feed(b'XII, mcm\n') == [(12, (0, 3)), (1900, (5, 8))]
+        assert parser.feed(b'IV') == []
+        assert parser.finish() == [(4, (9, 11))]
+
+    def test_straddling_chunks(self):
+        """ Tests that numerals split across chunks of any size are parsed identically """
+        stream = ' '.join(Roman.convert_to_roman(i) for i in range(0, 4000, 13)).encode()
+        expected = [i for i in range(0, 4000, 13)]
+
+        for chunk_size in (1, 2, 7, 64):
+            parser = IncrementalParser()
+            results = []
+            for i in range(0, len(stream), chunk_size):
+                results += parser.feed(stream[i:i + chunk_size])
+            results += parser.finish()
+
+            assert [value for value, _ in results] == expected
+            assert all(stream[start:end].decode() == Roman.convert_to_roman(value) for value, (start, end) in results)
+
+    @pytest.mark.parametrize('representation', ['LM', 'LLD', 'IIIII', 'MMMMC', 'VX', 'NN', 'NI', 'CCCCXXXX', 'XXXXL'])
+    def test_same_errors_as_validate(self, representation):
+        """ Tests that invalid numerals are rejected with the message returned by Roman.validate """
+        parser = IncrementalParser()
+        parser.feed(representation[:2].encode())
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            parser.feed(representation[2:].encode() + b' ')
+        assert str(e.value) == Roman.validate(representation)
+
+    def test_invalid_characters(self):
+        """ Tests that numerals containing invalid characters are rejected """
+        parser = IncrementalParser()
+        parser.feed(b'XK')
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            parser.finish()
+        assert str(e.value) == Roman.validate('XK')
+
+    def test_parsing_continues_after_error(self):
+        """ Tests that the numerals following an invalid one are still parsed """
+        parser = IncrementalParser()
+
+        with pytest.raises(RomanNumeralValueError):
+            parser.feed(b'X VV II')
+        assert parser.feed(b'I') == [(10, (0, 1))]
+        assert parser.finish() == [(3, (5, 8))]
+
+        parser = IncrementalParser(errors='skip')
+        assert parser.feed(b'X VV II ') == [(10, (0, 1)), (2, (5, 7))]
@@ -0,0 +1,32 @@
+from scripts import profile
+import subprocess
+import sys
+
+
+class TestProfile:
+    """ Tests for the profiling entry point """
+    def test_collapsed_stacks(self, tmp_path):
+        """ Tests that a workload is profiled into collapsed stacks rooted at the workload script """
+        workload = tmp_path / 'workload.py'
+        workload.write_text('from scripts.roman import Roman\n'
+                            'for i in range(500):\n'
+                            '    Roman.convert_to_decimal(Roman.convert_to_roman(i))\n')
+
+        stats, stacks, report = profile.profile_workload(str(workload), trace=True)
+        assert stacks and report.startswith('branch')
+
+        frames = [line.rsplit(' ', 1) for line in stacks]
+        assert all(int(microseconds) >= 1 for _, microseconds in frames)
+        assert any('<module> (workload.py:1)' in stack and 'convert_to_decimal (roman.py' in stack
+                   for stack, _ in frames)
+
+    def test_cli(self, tmp_path):
+        """ Tests that the entry point writes the collapsed stacks and the branch report """
+        workload = tmp_path / 'workload.py'
+        workload.write_text('from scripts.roman import Roman\nRoman("MMXXI")\n')
+        output = tmp_path / 'profile.folded'
+
+        result = subprocess.run([sys.executable, '-m', 'scripts.profile', str(workload), '--output', str(output),
+                                 '--trace'], check=True, capture_output=True, text=True)
+        assert 'validate.normalize' in result.stderr
+        assert any('workload.py' in line for line in output.read_text().splitlines())
@@ -1,7 +1,10 @@
 from scripts.exceptions import RomanNumeralTypeError, RomanNumeralValueError
-from scripts.roman import Roman, validated
+from scripts.enums import ValidationPolicy
+from scripts.roman import Roman, batch_validated, validated
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 import asyncio
+import pickle
 import pytest
 
 
@@ -103,6 +106,34 @@ class TestRoman:
         assert r.decimal == 0
         assert r.roman == 'N'
 
+    def test_unicode_representation(self):
+        """ Tests that Roman numerals can be created from representations containing Unicode Roman numerals, including
+        the single code point composites and the lowercase forms """
+        assert Roman('\u216b').decimal == 12
+        assert Roman('\u217f\u217f\u2169\u2179\u2170').roman == 'MMXXI'
+        assert Roman('\u216f\u216d\u216f\u2163').decimal == 1904
+        assert Roman('\u2180\u2186').decimal == 1050
+        assert Roman.convert_to_decimal('\u2167') == 8
+        assert '\u2169' in Roman('XX')
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            Roman('\u2162\u2160')
+        err_msg = 'Characters cannot be repeated more than 3 times in one succession (Repeated "I" too many times)'
+        assert str(e.value) == err_msg
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            Roman('\u2181')
+        assert str(e.value) == "The string representation provided contains invalid characters: {'\u2181'}"
+
+    def test_unicode_output(self):
+        """ Tests that decimal numbers can be converted to Unicode Roman numerals, which convert back to themselves """
+        assert Roman.convert_to_roman(1994, unicode=True) == '\u216f\u216d\u216f\u2169\u216d\u2160\u2164'
+        assert Roman.convert_to_roman(0, unicode=True) == 'N'
+        assert all(Roman.convert_to_decimal(Roman.convert_to_roman(i, unicode=True)) == i for i in range(4000))
+
+        with pytest.raises(RomanNumeralValueError):
+            Roman.convert_to_roman(4000, unicode=True)
+
     ### Tests for the type conversion methods
     def test_repr(self):
         """ Tests that the __repr__ method prints the expected information """
@@ -171,6 +202,49 @@ class TestRoman:
 
         assert d == {r: 'third', s: 'fourth'}
 
+    ### Tests for the serialization methods
+    def test_pickle(self):
+        """ Tests that Roman numerals are pickled compactly and unpickled to independent instances """
+        r = Roman('MMXXI')
+        data = pickle.dumps(r)
+
+        assert b'MMXXI' not in data
+        assert pickle.loads(data) == r
+        assert pickle.loads(data) is not pickle.loads(pickle.dumps(Roman(2021)))
+
+        a, b = pickle.loads(pickle.dumps(Roman('XIV'))), pickle.loads(pickle.dumps(Roman('XIV')))
+        assert list(zip(a, b)) == [('X', 'X'), ('I', 'I'), ('V', 'V')]
+
+        a.decimal = 15
+        assert b.decimal == 14
+
+        fibonacci = pickle.loads(pickle.dumps(Roman(13)))
+        fibonacci.decimal = 14
+        assert Roman.fibonacci_numbers()[6].decimal == 13
+
+    def test_pickle_round_trip(self, monkeypatch):
+        """ Tests that the whole domain round trips through pickle, using the precomputed table instead of the
+        validation and conversion of the constructor, and that invalid pickled values are rejected """
+        numerals = list(Roman.roman_generator())
+        data = pickle.dumps(numerals)
+        assert len(data) * 2 < len(pickle.dumps([vars(r) for r in numerals]))
+
+        def fail(*args):
+            raise AssertionError('Unpickling must not validate or convert')
+        monkeypatch.setattr(Roman, 'validate', staticmethod(fail))
+        monkeypatch.setattr(Roman, 'convert_to_roman', staticmethod(fail))
+        unpickled = pickle.loads(data)
+        monkeypatch.undo()
+
+        assert [vars(r) for r in unpickled] == [vars(r) for r in numerals]
+        assert list(unpickled[1994]) == ['M', 'C', 'M', 'X', 'C', 'I', 'V']
+
+        invalid = Roman(1)
+        invalid.decimal = 4000
+        with pytest.raises(RomanNumeralValueError) as e:
+            pickle.loads(pickle.dumps(invalid))
+        assert str(e.value) == 'The maximum Roman numeral is 3999 (Provided 4000)'
+
     ### Tests for the arithmetic operators
     def test_addition(self):
         """ Tests that Roman numerals can be added between them and with valid
@@ -430,6 +504,12 @@ class TestRoman:
         r2 = 'I'
         assert r1 == r2
 
+        assert Roman('IV') == 'ⅳ'
+        with pytest.raises(RomanNumeralValueError):
+            Roman('I') == 'IIII'
+        with pytest.raises(TypeError):
+            Roman('I') == 1.0
+
     def test_not_equal(self):
         """ Tests that Roman numerals can be "!=" compared between them and
         with valid string or integer representations of Roman numerals """
@@ -511,6 +591,24 @@ class TestRoman:
 
         assert list(Roman.fibonacci_generator()) == expected_numbers
 
+    def test_fibonacci_cache(self):
+        """ Tests that the Fibonacci numbers are computed once and support constant time lookups """
+        assert Roman.fibonacci_numbers() is Roman.fibonacci_numbers()
+        assert list(Roman.fibonacci_generator()) == list(Roman.fibonacci_numbers())
+
+        assert Roman.is_fibonacci(Roman(2584))
+        assert Roman.is_fibonacci('XXI')
+        assert not Roman.is_fibonacci(4)
+        assert Roman.fibonacci_index(1) == 0
+        assert Roman.fibonacci_index('CCCLXXVII') == 13
+
+        with pytest.raises(ValueError) as e:
+            Roman.fibonacci_index(4)
+        assert str(e.value) == '4 is not a Fibonacci number'
+
+        with pytest.raises(RomanNumeralValueError):
+            Roman.is_fibonacci(4181)
+
     def test_prime_generator(self):
         """ Tests that the prime_generator function generates the expected values """
         expected_numbers = [Roman(2), Roman(3), Roman(5), Roman(7), Roman(11), Roman(13), Roman(17),
@@ -633,6 +731,27 @@ class TestRoman:
         err_msg = 'Characters cannot be repeated more than 3 times in one succession (Repeated "X" too many times)'
         assert str(e.value) == err_msg
 
+    def test_batch_validated(self):
+        """ Tests the policies of the *batch_validated* decorator """
+        def total(representations: List) -> int:
+            return sum(Roman(r).decimal for r in representations)
+
+        batch = iter(['X', 'iv', 5, 'XXXX', 4000, 'Ⅻ'])
+        assert batch_validated(ValidationPolicy.FILTER)(total)(batch) == 31
+
+        result, errors = batch_validated(ValidationPolicy.PARTITION)(total)(['X', 'iv', 5, 'XXXX', 4000, 'Ⅻ'])
+        assert result == 31
+        err_msg = 'Characters cannot be repeated more than 3 times in one succession (Repeated "X" too many times)'
+        assert errors == [(3, 'XXXX', err_msg), (4, 4000, 'The maximum Roman numeral is 3999 (Provided 4000)')]
+
+        with pytest.raises(RomanNumeralValueError) as e:
+            batch_validated()(total)(['X', -1, 'A'])
+        assert str(e.value) == 'Negative Roman numerals do not exist; conversion is impossible (Provided -1)'
+        assert batch_validated()(total)(range(4)) == 6
+
+        with pytest.raises(RomanNumeralTypeError):
+            batch_validated(ValidationPolicy.FILTER)(total)(['X', 1.5])
+
     ### Tests for the coroutines
     @pytest.mark.asyncio
     async def test_producer(self):
@@ -662,3 +781,30 @@ class TestRoman:
                     Roman(23), Roman(29), Roman(31), Roman(37), Roman(41), Roman(43), Roman(47)]
 
         assert result == expected
+
+    @pytest.mark.asyncio
+    async def test_aconvert_many(self):
+        ''' Tests that the asynchronous bulk conversion yields the results in order, for thread and process pools '''
+        results = [r async for r in Roman.aconvert_many(range(4000), batch_size=100)]
+        assert results == [Roman.convert_to_roman(i) for i in range(4000)]
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = [r async for r in Roman.aconvert_many(['I', 'iv', 7, 'MMXXI'], executor=executor, batch_size=3)]
+        assert results == [1, 4, 'VII', 2021]
+
+    @pytest.mark.asyncio
+    async def test_aconvert_many_errors_and_cancellation(self):
+        ''' Tests that conversion errors are raised in order and that closing the generator cancels pending batches '''
+        results = []
+        with pytest.raises(RomanNumeralValueError):
+            async for r in Roman.aconvert_many([1, 2, 3, 4000, 5], batch_size=2):
+                results.append(r)
+        assert results == ['I', 'II']
+
+        for batch_size, max_pending in ((0, 4), (10, 0)):
+            with pytest.raises(ValueError):
+                await Roman.aconvert_many([1, 2], batch_size=batch_size, max_pending=max_pending).__anext__()
+
+        generator = Roman.aconvert_many(range(4000), batch_size=10, max_pending=2)
+        assert await generator.__anext__() == 'N'
+        await generator.aclose()
@@ -0,0 +1,103 @@
+from scripts.exceptions import RomanNumeralValueError
+from scripts.roman import Roman
+from scripts.server import LINE_LIMIT, RomanClient, RomanServer, handle_request
+import asyncio
+import pytest
+
+
+class TestServer:
+    """ Tests for the conversion server and its client, running on localhost """
+    ### Tests for the line protocol
+    def test_handle_request(self):
+        """ Tests that the requests of the line protocol are answered correctly """
+        assert handle_request('ROMAN 1 4 3999\n') == 'OK I IV MMMCMXCIX'
+        assert handle_request('decimal xiv MMXXI') == 'OK 14 2021'
+        assert handle_request('VALIDATE IIII XIV 4000 0') == 'OK 0 1 0 1'
+        assert handle_request('ROMAN 4000') == 'ERR The maximum Roman numeral is 3999 (Provided 4000)'
+        assert handle_request('SQRT 4').startswith('ERR Unknown command')
+
+    ### Tests for the server and client
+    @pytest.mark.asyncio
+    async def test_tcp(self):
+        """ Tests the conversions over TCP, with concurrent requests sharing the connection pool """
+        async with RomanServer() as server, RomanClient(port=server.port, pool_size=2) as client:
+            assert await client.to_roman([1, 2021]) == ['I', 'MMXXI']
+            assert await client.to_decimal(['I', Roman(5)]) == [1, 5]
+            assert await client.validate(['IIII', 'XIV', 4000]) == [False, True, False]
+
+            results = await asyncio.gather(*(client.to_roman([i]) for i in range(50)))
+            assert results == [[Roman.convert_to_roman(i)] for i in range(50)]
+            assert len(client._idle) <= 2
+
+            with pytest.raises(RomanNumeralValueError) as e:
+                await client.to_decimal(['LLD'])
+            assert str(e.value) == 'Only "I", "X", "C" and "M" can be repeated in succession (Repeated "L")'
+
+    @pytest.mark.asyncio
+    async def test_failed_connection_frees_slot(self):
+        """ Tests that a request waiting for a connection slot opens a new connection when the busy one fails """
+        connections = 0
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            nonlocal connections
+            connections += 1
+            while line := await reader.readline():
+                if connections == 1:
+                    break
+                writer.write(handle_request(line.decode()).encode() + b'\n')
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server, RomanClient(port=port, pool_size=1) as client:
+            first, second = await asyncio.wait_for(
+                asyncio.gather(client.to_roman([1]), client.to_roman([2]), return_exceptions=True), timeout=5)
+
+            assert isinstance(first, ConnectionError)
+            assert second == ['II']
+            assert connections == 2
+
+    @pytest.mark.asyncio
+    async def test_pipelining(self, tmp_path):
+        """ Tests that pipelined requests over a Unix socket are answered in order """
+        path = str(tmp_path / 'roman.sock')
+        async with RomanServer(path=path) as server, RomanClient(path=server.path) as client:
+            requests = [('ROMAN', list(range(i, i + 100))) for i in range(0, 4000, 100)]
+            results = await client.execute_many(requests)
+
+            assert sum(results, []) == [Roman.convert_to_roman(i) for i in range(4000)]
+
+    @pytest.mark.asyncio
+    async def test_line_limit(self):
+        """ Tests that overlong request lines are answered with an error, and that large batches are split by the
+        client so that the responses fit in the line limit """
+        async with RomanServer() as server, RomanClient(port=server.port) as client:
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            writer.write(b'ROMAN ' + b'1 ' * LINE_LIMIT + b'\nROMAN 4\n')
+            assert await reader.readline() == f'ERR The request line exceeds the limit of {LINE_LIMIT} bytes\n'.encode()
+            assert await reader.readline() == b'OK IV\n'
+            writer.close()
+
+            results = await client.execute_many([('ROMAN', [3888] * 400000), ('DECIMAL', ['X'])])
+            assert results == [['MMMDCCCLXXXVIII'] * 400000, ['10']]
+            assert await client.to_roman([]) == []
+
+    @pytest.mark.asyncio
+    async def test_connection_limit(self):
+        """ Tests that connections over the limit are refused """
+        async with RomanServer(max_connections=1) as server:
+            first, second = RomanClient(port=server.port), RomanClient(port=server.port)
+            assert await first.to_roman([1]) == ['I']
+
+            with pytest.raises(RomanNumeralValueError) as e:
+                await second.to_roman([1])
+            assert str(e.value) == 'Too many connections (Limit: 1)'
+            assert not second._idle
+
+            await first.close()
+            while server.connections:
+                await asyncio.sleep(0.01)
+            assert await second.to_roman([2]) == ['II']
+
+            await second.close()
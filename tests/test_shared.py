@@ -0,0 +1,72 @@
+from concurrent.futures import ProcessPoolExecutor
+from scripts import shared
+from scripts.enums import NumeralProperty
+from scripts.exceptions import RomanNumeralValueError
+from scripts.roman import Roman
+from scripts.shared import SharedTables
+import os
+import pytest
+
+
+def convert_in_worker(values):
+    """ Converts values in a worker process, using the shared tables attached by the pool initializer """
+    tables = shared.worker_tables()
+    return [tables.to_roman(v) if isinstance(v, int) else tables.to_decimal(v) for v in values]
+
+
+class TestSharedTables:
+    """ Tests for the conversion tables shared between processes """
+    def test_shared_memory(self):
+        """ Tests that the tables published in shared memory can be attached and queried """
+        published = SharedTables.publish()
+        try:
+            attached = SharedTables.attach(published.name)
+
+            assert [attached.to_roman(i) for i in range(4000)] == [Roman.convert_to_roman(i) for i in range(4000)]
+            assert [attached.to_decimal(Roman.convert_to_roman(i)) for i in range(4000)] == list(range(4000))
+            assert attached.to_decimal('iiX') == Roman.convert_to_decimal('IIX')
+            assert attached.length(3888) == 15
+            assert attached.properties(89) == NumeralProperty.PRIME | NumeralProperty.FIBONACCI | NumeralProperty.IX
+
+            with pytest.raises(RomanNumeralValueError):
+                attached.to_roman(4000)
+            with pytest.raises(TypeError):
+                attached.buffer[0] = 0
+
+            attached.close()
+        finally:
+            published.close()
+            published.unlink()
+
+    def test_process_pool(self):
+        """ Tests that worker processes attach to the published tables through the pool initializer """
+        published = SharedTables.publish()
+        try:
+            with ProcessPoolExecutor(2, initializer=shared.worker_initializer, initargs=(published.name,)) as pool:
+                results = list(pool.map(convert_in_worker, [[1, 2, 3], ['MMXXI', 'iv']]))
+            assert results == [['I', 'II', 'III'], [2021, 4]]
+        finally:
+            published.close()
+            published.unlink()
+
+    def test_file(self, tmp_path):
+        """ Tests that the tables can be memory-mapped from a file, which is rewritten atomically, and that stale files
+        are rejected """
+        path = str(tmp_path / 'tables.bin')
+        SharedTables.write_file(path)
+
+        mapped = SharedTables.from_file(path)
+        inode = os.stat(path).st_ino
+        SharedTables.write_file(path)
+        assert os.stat(path).st_ino != inode
+        assert os.listdir(tmp_path) == ['tables.bin']
+        assert mapped.to_roman(1994) == 'MCMXCIV'
+        assert mapped.to_decimal('MCMXCIV') == 1994
+        mapped.close()
+
+        with open(path, 'r+b') as f:
+            f.seek(8)
+            f.write(b'\0\0\0\0')
+        with pytest.raises(ValueError) as e:
+            SharedTables.from_file(path)
+        assert 'stale' in str(e.value)
@@ -0,0 +1,95 @@
+from scripts import dialects, indexes, snapshot, tables
+from scripts.enums import Dialect
+from scripts.roman import Roman
+import os
+import pytest
+import subprocess
+import sys
+import warnings
+
+
+class TestSnapshot:
+    """ Tests for the on-disk snapshot of the conversion tables """
+    def test_load(self, tmp_path, monkeypatch):
+        """ Tests that a written snapshot is loaded as the conversion tables """
+        path = str(tmp_path / 'tables.snapshot')
+        assert snapshot.write(path) == path
+        monkeypatch.setattr(tables, '_preloaded_romans', None)
+
+        assert snapshot.load(path)
+        assert tables._preloaded_romans == tuple(Roman.convert_to_roman(i) for i in range(4000))
+        assert tables.roman_table() is tables._preloaded_romans
+        assert tables.to_decimal('MCMXCIV') == 1994
+        assert not snapshot.load(str(tmp_path / 'missing.snapshot'))
+
+    def test_preload_clears_derived_caches(self, monkeypatch):
+        """ Tests that replacing the tables also rebuilds the caches computed from them """
+        monkeypatch.setattr(tables, '_preloaded_romans', None)
+        reference = tables.roman_table()
+        index, compiled = indexes.property_index(), dialects.compiled(Dialect.STRICT)
+
+        patched = reference[:4] + ('VI',) + reference[5:]
+        try:
+            tables.preload(patched)
+            assert indexes.property_index() is not index and indexes.property_index().lengths[4] == 2
+            assert dialects.compiled(Dialect.STRICT) is not compiled
+            assert dialects.to_roman(4) == 'VI'
+        finally:
+            tables.preload(None)
+
+        assert tables.roman_table() == reference and dialects.to_roman(4) == 'IV'
+        assert indexes.substring_index().containing('IV')[0] == 4
+
+    def test_write_rebuilds_tables(self, tmp_path, monkeypatch):
+        """ Tests that the snapshot is written from the reference implementation, not from the loaded tables """
+        monkeypatch.setattr(tables, '_preloaded_romans', None)
+        reference = tables.roman_table()
+        tables.preload(reference[:4] + ('VI',) + reference[5:])
+
+        path = snapshot.write(str(tmp_path / 'tables.snapshot'))
+        assert tables.roman_table() == reference
+        with open(path, 'rb') as f:
+            assert snapshot.read_romans(f.read()) == reference
+
+    def test_corrupted_snapshot(self, tmp_path):
+        """ Tests that snapshots whose table data was modified are rejected """
+        path = str(tmp_path / 'tables.snapshot')
+        snapshot.write(path)
+        with open(path, 'r+b') as f:
+            f.seek(snapshot.HEADER.size + 4 * snapshot.STRING_WIDTH)
+            f.write(b'VI')
+
+        with pytest.raises(ValueError) as e:
+            snapshot.load(path)
+        assert 'corrupted' in str(e.value)
+
+    def test_stale_snapshot(self, tmp_path, monkeypatch):
+        """ Tests that stale snapshots are rejected, with only a warning when loaded automatically """
+        path = str(tmp_path / 'tables.snapshot')
+        snapshot.write(path)
+        with open(path, 'r+b') as f:
+            f.seek(8)
+            f.write(b'\0\0\0\0')
+
+        with pytest.raises(ValueError) as e:
+            snapshot.load(path)
+        assert 'stale' in str(e.value)
+
+        monkeypatch.setenv(snapshot.SNAPSHOT_VARIABLE, path)
+        with pytest.warns(RuntimeWarning):
+            assert not snapshot.autoload()
+
+        monkeypatch.setenv(snapshot.SNAPSHOT_VARIABLE, '')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            assert not snapshot.autoload()
+
+    def test_cli(self, tmp_path):
+        """ Tests that the snapshot is regenerated from the command line and loaded when scripts.roman is imported """
+        path = str(tmp_path / 'tables.snapshot')
+        subprocess.run([sys.executable, '-m', 'scripts.snapshot', '--output', path], check=True, capture_output=True)
+
+        code = 'from scripts import roman, tables; print(tables._preloaded_romans[1994])'
+        result = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True,
+                                env={**os.environ, snapshot.SNAPSHOT_VARIABLE: path})
+        assert result.stdout.strip() == 'MCMXCIV'
@@ -0,0 +1,57 @@
+from scripts.sqlite_functions import register_functions
+import pytest
+import sqlite3
+
+
+class TestSqliteFunctions:
+    """ Tests for the SQLite user-defined functions """
+    @staticmethod
+    def connect(errors: str = 'raise') -> sqlite3.Connection:
+        """ Returns an in-memory connection with the functions registered and a small table of numerals """
+        connection = sqlite3.connect(':memory:')
+        register_functions(connection, errors)
+        connection.execute('CREATE TABLE t (r TEXT, n INTEGER)')
+        connection.executemany('INSERT INTO t (r) VALUES (?)', [('X',), ('iv',), ('MCMXCIV',), (None,)])
+        return connection
+
+    ### Tests for the scalar functions
+    def test_conversions(self):
+        """ Tests the conversions run inside UPDATE and SELECT statements """
+        connection = self.connect()
+        connection.execute('UPDATE t SET n = roman_to_int(r)')
+
+        rows = connection.execute('SELECT n, int_to_roman(n), roman_valid(r) FROM t ORDER BY rowid').fetchall()
+        assert rows == [(10, 'X', 1), (4, 'IV', 1), (1994, 'MCMXCIV', 1), (None, None, None)]
+        assert connection.execute("SELECT roman_valid('IIII'), roman_valid(4000), roman_valid(1.5)").fetchone() == \
+            (0, 0, 0)
+
+    def test_expression_index(self):
+        """ Tests that the deterministic functions can be used in indexes on expressions """
+        connection = self.connect()
+        connection.execute('CREATE INDEX t_decimal ON t (roman_to_int(r))')
+
+        plan = connection.execute('EXPLAIN QUERY PLAN SELECT r FROM t WHERE roman_to_int(r) = 4').fetchall()
+        assert 't_decimal' in str(plan)
+        assert connection.execute('SELECT r FROM t WHERE roman_to_int(r) = 4').fetchall() == [('iv',)]
+
+    def test_errors(self):
+        """ Tests the policies for invalid values """
+        with pytest.raises(sqlite3.OperationalError):
+            self.connect().execute("SELECT roman_to_int('XXXX')").fetchall()
+        with pytest.raises(ValueError):
+            register_functions(sqlite3.connect(':memory:'), errors='ignore')
+
+        connection = self.connect('null')
+        assert connection.execute("SELECT roman_to_int('XXXX'), int_to_roman(4000)").fetchone() == (None, None)
+        assert connection.execute("SELECT roman_sum(r) FROM (SELECT 'MMM' AS r UNION ALL SELECT 'M')").fetchone() == \
+            (None,)
+
+    ### Tests for the aggregate function
+    def test_roman_sum(self):
+        """ Tests the sum of Roman numerals, which skips NULLs and is NULL for empty groups """
+        connection = self.connect()
+        assert connection.execute('SELECT roman_sum(r) FROM t').fetchone() == ('MMVIII',)
+        assert connection.execute('SELECT roman_sum(r) FROM t WHERE r IS NULL').fetchone() == (None,)
+
+        with pytest.raises(sqlite3.OperationalError):
+            connection.execute("SELECT roman_sum(r) FROM (SELECT 'MMM' AS r UNION ALL SELECT 'M')").fetchone()
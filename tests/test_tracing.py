@@ -0,0 +1,39 @@
+from scripts import tracing
+from scripts.roman import Roman
+import pytest
+
+
+class TestTracing:
+    """ Tests for the branch tracing mode of Roman.validate and Roman.convert_to_decimal """
+    def test_branch_counts(self):
+        """ Tests that the branches taken while converting are counted and timed """
+        with tracing.trace() as tracer:
+            assert Roman.convert_to_decimal('MCMXCIV') == 1994
+            assert Roman.validate(12) == 'OK'
+
+        assert tracer.counts['validate.normalize'] == 1
+        assert tracer.counts['validate.subtractive'] == 6
+        assert tracer.counts['validate.int'] == 1
+        assert tracer.counts['decimal.subtractive'] == 3
+        assert tracer.counts['decimal.descending'] == 1
+        assert tracer.counts['decimal.last'] == 0
+        assert all(tracer.times[label] > 0 for label in tracer.counts)
+
+        report = tracer.report()
+        assert [row[2] for row in report] == sorted((row[2] for row in report), reverse=True)
+        assert tracer.format_report().splitlines()[0].split() == \
+            ['branch', 'hits', 'time', '(ms)', 'per', 'hit', '(us)']
+
+    def test_session(self):
+        """ Tests that the tracing mode is disabled, and the methods restored, when the session ends """
+        validate, convert_to_decimal = Roman.__dict__['validate'], Roman.__dict__['convert_to_decimal']
+        with pytest.raises(ZeroDivisionError):
+            with tracing.trace():
+                with pytest.raises(RuntimeError):
+                    with tracing.trace():
+                        pass
+                1 // 0
+
+        assert tracing.active is None
+        assert Roman.__dict__['validate'] is validate and Roman.__dict__['convert_to_decimal'] is convert_to_decimal
+        assert Roman('XIV').decimal == 14
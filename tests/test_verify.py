@@ -0,0 +1,41 @@
+from scripts import verify
+import pytest
+
+
+class TestVerify:
+    """ Tests for the differential verification runner """
+    def test_near_misses(self):
+        """ Tests that the corpus holds one-edit variants of the numerals, without the canonical numerals """
+        corpus = set(verify.near_misses())
+        assert {'XIIII', 'IIX', 'VX', 'XAV', 'iix', 'MMMM'} <= corpus
+        assert not corpus.intersection({'', 'XIV', 'MCMXCIV'})
+
+        sample = verify.near_misses(max_strings=100, seed=1)
+        assert len(sample) == 100 and set(sample) <= corpus and sample == verify.near_misses(max_strings=100, seed=1)
+
+    def test_run_verification(self):
+        """ Tests that every available backend matches the reference over the domain and a sample of the corpus """
+        report = verify.run_verification(workers=0, max_strings=2000)
+
+        assert report['ok'] and report['mismatches'] == {}
+        assert report['cases'] == {'domain': 4000, 'corpus': 2000}
+        assert set(report['backends']) == set(verify.available_backends())
+        assert report['backends']['tables']['checks'] == 2 * 4000 + 2000
+        assert report['backends']['parser']['checks'] == 4000 + 2000
+        assert report['backends']['dialect-lenient']['checks'] == 2 * 4000
+        assert all(backend['checks_per_s'] > 0 for backend in report['backends'].values())
+
+    def test_mismatches_and_pool(self, monkeypatch):
+        """ Tests that mismatches are reported, using a process pool """
+        report = verify.run_verification(['tables', 'sqlite'], workers=2, max_strings=200, chunk_size=500)
+        assert report['ok'] and report['workers'] == 2
+
+        monkeypatch.setitem(verify.BACKENDS, 'broken', lambda: verify.Backend('broken', lambda n: 'N', None))
+        report = verify.run_verification(['broken'], workers=0, max_strings=0, max_reported=3)
+        assert not report['ok']
+        assert report['backends']['broken']['mismatches'] == 3999
+        assert report['mismatches']['broken'][0] == {'direction': 'to_roman', 'input': 1, 'expected': ['OK', 'I'],
+                                                     'actual': ['OK', 'N']}
+
+        with pytest.raises(ValueError):
+            verify.run_verification(['missing'])